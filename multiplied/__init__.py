@@ -20,6 +20,9 @@ from .core.matrix import (
     empty_rows,
     empty_matrix,
     matrix_merge,
+    merge_masks,
+    pack_rows,
+    unpack_rows,
 )
 
 
@@ -30,18 +33,31 @@ from .core.template import (
     build_adder,
     resolve_pattern,
     build_empty_slice,
+    template_cache_info,
+    template_cache_clear,
 )
 
 from .core.algorithm import (
     Algorithm,
+    unit_values,
+    unit_occupancy,
     collect_arithmetic_units,
 )
 
+from .core.scope import (
+    Scope,
+    TruthScope,
+    SampleScope,
+)
+
 from .core.truth import (
     truth_scope,
     truth_table,
     truth_dataframe,
     shallow_truth_table,
+    parallel_truth_table,
+    truth_layout,
+    unpack_truth_frame,
 )
 
 
@@ -79,29 +95,45 @@ from .io.lazy_json import (
     json_pretty_store,
 )
 
-from .io.parquet import(
-    export_parquet,
-    import_parquet,
-)
-
-# -- Analysis -------------------------------------------------------
-
-# from .analysis.context import ()
+# -- lazy -----------------------------------------------------------
+#
+# Parquet and analysis layers pull in pyarrow, pandas and matplotlib,
+# they are imported on first attribute access (PEP 562) so the core,
+# and every worker process, starts without them.
+
+_LAZY = {
+    'export_parquet':              '.io.parquet',
+    'import_parquet':              '.io.parquet',
+    'select_columns':              '.io.parquet',
+    'truth_metadata':              '.io.parquet',
+    'import_metadata':             '.io.parquet',
+    'TruthWriter':                 '.io.parquet',
+    'TruthTableDataset':           '.analysis.context',
+    'pq_extract_bits':             '.analysis.extract',
+    'pq_extract_stages':           '.analysis.extract',
+    'pq_extract_formatted_all':    '.analysis.extract',
+    'pq_extract_formatted_stages': '.analysis.extract',
+    'heatmap_tensor':              '.analysis.heatmap',
+    'HeatmapAccumulator':          '.analysis.heatmap',
+    'heatmap_counts':              '.analysis.heatmap',
+    'df_global_heatmap':           '.analysis.heatmap',
+    'df_global_3d_heatmap':        '.analysis.heatmap',
+    'df_stage_heatmap':            '.analysis.heatmap',
+    'df_stage_bound_heatmap':      '.analysis.heatmap',
+}
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value # cache, later lookups skip __getattr__
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
 
-from .analysis.extract import (
-    pq_extract_bits,
-    pq_extract_stages,
-    pq_extract_formatted_all,
-    pq_extract_formatted_stages,
-)
-
-
-from .analysis.heatmap import (
-    df_global_heatmap,
-    df_global_3d_heatmap,
-    df_stage_heatmap,
-    df_stage_bound_heatmap,
-)
 
 # from .analysis.search import ()
 
@@ -141,6 +173,11 @@ __all__ = [
     'empty_rows',
     'empty_matrix',
     'matrix_merge',
+    'merge_masks',
+    'pack_rows',
+    'unpack_rows',
+    'unit_values',
+    'unit_occupancy',
     'collect_arithmetic_units',
     'build_dadda_map',
     'empty_map',
@@ -148,10 +185,18 @@ __all__ = [
     'build_adder',
     'build_empty_slice',
     'resolve_pattern',
+    'template_cache_info',
+    'template_cache_clear',
     'truth_scope',
+    'Scope',
+    'TruthScope',
+    'SampleScope',
     'shallow_truth_table',
     'truth_table',
+    'parallel_truth_table',
     'truth_dataframe',
+    'truth_layout',
+    'unpack_truth_frame',
     'Map',
     'ischar',
     'isalpha',
@@ -169,10 +214,18 @@ __all__ = [
     'json_pretty_store',
     'export_parquet',
     'import_parquet',
+    'select_columns',
+    'truth_metadata',
+    'import_metadata',
+    'TruthWriter',
+    'TruthTableDataset',
     'pq_extract_bits',
     'pq_extract_stages',
     'pq_extract_formatted_all',
     'pq_extract_formatted_stages',
+    'heatmap_tensor',
+    'HeatmapAccumulator',
+    'heatmap_counts',
     'df_global_heatmap',
     'df_global_3d_heatmap',
     'df_stage_heatmap',
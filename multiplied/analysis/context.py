@@ -13,3 +13,267 @@ accommodate other analysis functions.
 
 Use pyarrow.dataset when working with multiple files
 """
+
+import os
+from collections.abc import Generator
+from multiprocessing import Pool
+from typing import Any
+from multiplied import Algorithm, Scope
+import pandas as pd
+import pyarrow as pa
+
+
+# -- layout ---------------------------------------------------------
+#
+# Hive partitioned by algorithm fingerprint, then operand a high bits:
+#
+# root/alg=<fingerprint>/a_hi=<a >> shift>/part-0.parquet
+#
+# shift = bits - partition_bits, stored in each file's metadata so
+# predicates on a can prune partitions.
+
+Interval = int | tuple[int, int]
+
+_UNSET = object() # shift not yet read from partition metadata
+
+class TruthTableDataset():
+    """
+    Directory of partitioned .parquet truth tables, written and read as one.
+
+    >>> with TruthTableDataset('8b_tables') as ds:
+    ...     ds.write(alg, partition_bits=4, processes=4)
+    ...     for df in ds.scan(stages=[0, 1], a=(16, 31), output=(0, 255)):
+    ...         ...
+    """
+
+    def __init__(self, root: str) -> None:
+        if not isinstance(root, str):
+            raise TypeError("root must be a string")
+        self.root = root
+        self._dataset = None
+        self._shift: Any = _UNSET
+
+    def __enter__(self) -> 'TruthTableDataset':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._dataset = None
+
+    def __repr__(self) -> str:
+        return f"TruthTableDataset({self.root!r})"
+
+    # -- write ------------------------------------------------------
+
+    def write(self, alg: Algorithm, scope: Generator[tuple[int, int]] | Scope | None = None, *,
+        partition_bits: int = 2,
+        processes: int | None = None,
+        batch_size: int = 16384,
+        layout: str = 'bits',
+    ) -> list[str]:
+        """
+        Write truth table of alg into partition files, return their paths.
+        Without scope the exhaustive table over all bits wide operands is
+        written, each partition evaluated by its own worker process.
+        Scopes are consumed once and routed to partitions in this process.
+
+        Options:
+            partition_bits: High bits of operand a used to partition files
+            processes: Number of worker processes for exhaustive tables
+            batch_size: Number of rows written per row group
+            layout: Column layout 'bits' or 'packed', see mp.truth_dataframe()
+        """
+        from multiplied.core.truth import _chunks, validate_layout
+
+        if not isinstance(alg, Algorithm):
+            raise TypeError(f"Expected Algorithm instance got {type(alg)}")
+        if scope is not None and not isinstance(scope, Generator | Scope):
+            raise TypeError("Scope must be a generator or Scope instance.")
+        if not isinstance(partition_bits, int) or not 0 <= partition_bits <= alg.bits:
+            raise ValueError(f"partition_bits must be within 0..{alg.bits}, got {partition_bits}")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+        validate_layout(layout, alg.bits)
+
+        # compile a detached copy, leaving source algorithm untouched
+        alg = alg.detach()
+        if alg.plan is None:
+            alg.compile()
+        shift = alg.bits - partition_bits
+        self._dataset = None
+
+        # -- exhaustive: one task per partition ---------------------
+        if scope is None:
+            tasks = [
+                (alg, self.partition_path(alg, k), k, shift, batch_size, layout)
+                for k in range(1 << partition_bits)
+            ]
+            with Pool(processes) as pool:
+                paths = list(pool.imap(_write_partition, tasks))
+                pool.close()
+                pool.join()
+            return paths
+
+        # -- scope: route operand pairs to partition writers --------
+        writers: dict[int, Any] = {}
+        buffers: dict[int, list[tuple[int, int]]] = {}
+        try:
+            for chunk in _chunks(scope, batch_size):
+                for a, b in chunk:
+                    k = a >> shift
+                    buffer = buffers.setdefault(k, [])
+                    buffer.append((a, b))
+                    if len(buffer) < batch_size:
+                        continue
+                    if k not in writers:
+                        writers[k] = _partition_writer(self.partition_path(alg, k), alg, shift, layout)
+                    writers[k].write(buffer)
+                    buffers[k] = []
+            for k, buffer in buffers.items():
+                if k not in writers:
+                    writers[k] = _partition_writer(self.partition_path(alg, k), alg, shift, layout)
+                if buffer:
+                    writers[k].write(buffer)
+        finally:
+            for writer in writers.values():
+                writer.close()
+        return [writers[k].path for k in sorted(writers)]
+
+    def partition_path(self, alg: Algorithm, k: int) -> str:
+        """Return path of partition k of alg, creating its directory"""
+        directory = os.path.join(self.root, f"alg={alg.fingerprint()}", f"a_hi={k}")
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, 'part-0.parquet')
+
+    # -- read -------------------------------------------------------
+
+    @property
+    def dataset(self) -> Any:
+        """pyarrow.dataset.Dataset over every partition file"""
+        import pyarrow.dataset as pads
+
+        if self._dataset is None:
+            partitioning = pads.partitioning(
+                pa.schema([('alg', pa.string()), ('a_hi', pa.int64())]), flavor='hive'
+            )
+            self._dataset = pads.dataset(self.root, format='parquet', partitioning=partitioning)
+            self._shift   = _UNSET
+        return self._dataset
+
+    @property
+    def fingerprints(self) -> list[str]:
+        """Fingerprints of algorithms stored in dataset"""
+        return sorted(
+            name.split('=', 1)[1] for name in os.listdir(self.root)
+            if name.startswith('alg=')
+        )
+
+    def filter(self, *,
+        alg: Algorithm | str | None = None,
+        a: Interval | None = None,
+        b: Interval | None = None,
+        output: Interval | None = None,
+    ) -> Any:
+        """
+        Return pyarrow expression selecting rows of alg, or fingerprint,
+        whose a, b and output lie within inclusive (lo, hi) bounds or equal
+        a given int. Bounds on a also prune a_hi partitions.
+        """
+        import pyarrow.compute as pc
+        from multiplied.io.parquet import operand_filter, _interval
+
+        expression = operand_filter(a=a, b=b, output=output)
+        def extend(e):
+            nonlocal expression
+            expression = e if expression is None else expression & e
+
+        if alg is not None:
+            extend(pc.field('alg') == (alg if isinstance(alg, str) else alg.fingerprint()))
+        if a is not None and (shift := self.shift()) is not None:
+            lo, hi = _interval(a, 'a')
+            extend((pc.field('a_hi') >= lo >> shift) & (pc.field('a_hi') <= hi >> shift))
+        return expression
+
+    def scan(self, *,
+        alg: Algorithm | str | None = None,
+        a: Interval | None = None,
+        b: Interval | None = None,
+        output: Interval | None = None,
+        stages: list[int] | None = None,
+        ppm: list[int] | None = None,
+        bits: list[int] | None = None,
+        columns: list[str] | None = None,
+        batch_size: int = 16384,
+        arrow: bool = False,
+    ) -> Generator[pd.DataFrame | pa.RecordBatch]:
+        """
+        Yield rows matching predicates in batches of at most batch_size rows.
+        Predicates are pushed down to partitions and row group statistics.
+
+        Options:
+            alg, a, b, output: Predicates, see TruthTableDataset.filter()
+            stages, ppm, bits, columns: Projection, see mp.select_columns()
+            arrow: Yield pyarrow.RecordBatch instead of pandas DataFrame
+        """
+        from multiplied.io.parquet import select_columns
+
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+        projection = select_columns(self.dataset.schema.names,
+            stages=stages, ppm=ppm, bits=bits, columns=columns
+        )
+        scanner = self.dataset.scanner(
+            columns=projection,
+            filter=self.filter(alg=alg, a=a, b=b, output=output),
+            batch_size=batch_size,
+        )
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch if arrow else batch.to_pandas()
+
+    def to_pandas(self, **kwargs: Any) -> pd.DataFrame:
+        """Return every row matching predicates, see TruthTableDataset.scan()"""
+        batches = list(self.scan(arrow=True, **kwargs))
+        if not batches:
+            return pd.DataFrame()
+        return pa.Table.from_batches(batches).to_pandas()
+
+    def count(self, **kwargs: Any) -> int:
+        """Return number of rows matching predicates"""
+        return self.dataset.count_rows(filter=self.filter(**kwargs))
+
+    def shift(self) -> int | None:
+        """
+        Return a_hi partition shift shared by every file, None if files were
+        written with different partition_bits or lack shift metadata, in
+        which case partitions are not pruned.
+        """
+        from multiplied.io.parquet import import_metadata
+
+        if self._shift is _UNSET:
+            shifts = {import_metadata(path).get('shift') for path in self.dataset.files}
+            shift  = shifts.pop() if len(shifts) == 1 else None
+            self._shift = shift if isinstance(shift, int) else -1
+        return None if self._shift < 0 else self._shift
+
+
+def _partition_writer(path: str, alg: Algorithm, shift: int, layout: str) -> Any:
+    from multiplied.io.parquet import TruthWriter
+    return TruthWriter(path, alg, layout=layout, metadata={'shift': shift})
+
+def _write_partition(task: tuple[Algorithm, str, int, int, int, str]) -> str:
+    """Pool task: write exhaustive truth table of a single a_hi partition"""
+    from multiplied.core.truth import _chunks
+
+    alg, path, k, shift, batch_size, layout = task
+    scope = (
+        (a, b)
+        for a in range(k << shift, (k + 1) << shift)
+        for b in range(1 << alg.bits)
+    )
+    writer = _partition_writer(path, alg, shift, layout)
+    try:
+        for chunk in _chunks(scope, batch_size):
+            writer.write(chunk)
+    finally:
+        writer.close()
+    return path
@@ -20,8 +20,6 @@ import pyarrow as pa
 #
 #
 
-# TODO add metadata to .parquet datasets to extract bit width, alg length etc
-
 
 def validate_path(path: str) -> None:
     if not isinstance(path, str):
@@ -29,10 +27,48 @@ def validate_path(path: str) -> None:
     if not path.endswith('.parquet'):
         raise ValueError("path must end with .parquet")
 
-def pq_extract_bits(path: str, bits: list[int], stages: list[int]) -> pd.DataFrame:
-    """Return a DataFrame of specified bits across multiple stages from .parquet"""
+def pq_extract_bits(path: str, bits: list[int], stages: list[int], *,
+    ppm: list[int] | None = None,
+    columns: list[str] | None = None,
+    a: int | tuple[int, int] | None = None,
+    b: int | tuple[int, int] | None = None,
+    output: int | tuple[int, int] | None = None,
+) -> pd.DataFrame:
+    """
+    Return a DataFrame of specified bits across multiple stages from .parquet
+
+    Only "stage_{s}_ppm_{p}_b_{b}" columns of the given bits and stages,
+    and optionally ppm rows, are read. Filters on a, b and output, an int
+    or inclusive (lo, hi) bounds, skip row groups using Parquet statistics.
+
+    Packed layout files are read by row value columns, unpacking only the
+    requested bits.
+
+    >>> pq_extract_bits(path, [7, 8], [0, 1], columns=['a', 'b'], output=(0, 255))
+    """
+    import pyarrow.parquet as pq
+    from multiplied.io.parquet import select_columns, operand_filter
+    from multiplied.core.truth import truth_layout, unpack_truth_frame
+
     validate_path(path)
-    raise NotImplementedError
+    for name, selection in (('bits', bits), ('stages', stages)):
+        if not isinstance(selection, list) or not all(isinstance(i, int) for i in selection):
+            raise TypeError(f"{name} must be a list of integers, got {selection}")
+
+    names = pq.read_schema(path).names
+    projection = select_columns(names,
+        stages=stages, ppm=ppm, bits=bits, columns=columns
+    )
+    packed = truth_layout(names) == 'packed'
+    if packed:
+        projection = [name for name in projection if not name.endswith('_o')]
+    table = pq.read_table(path,
+        columns=projection, filters=operand_filter(a=a, b=b, output=output)
+    )
+    if packed:
+        width = 2 * sum(name.endswith('_v') and name.startswith('stage_0_') for name in names)
+        return unpack_truth_frame(table.to_pandas(), bits=bits, width=width)
+    return table.to_pandas()
 
 
 
@@ -41,38 +77,29 @@ def pq_extract_bits(path: str, bits: list[int], stages: list[int]) -> pd.DataFra
 def pq_extract_stages(path: str, *, stages: list[str]=[]) -> pd.DataFrame:
     """Return a DataFrame of specified stages from .parquet"""
 
-    # Documentation is getting really annoying to find so the following is
-    # just an attempt to get things to work
-
-    # -- row[0] without loading entire file -------------------------
     validate_path(path)
-    from pyarrow.parquet import ParquetFile
-    pf = ParquetFile(path)
-    first = next(pf.iter_batches(batch_size = 1))
-    row = pa.Table.from_batches([first]).to_pandas()
-    # pd.set_option('display.max_columns', None)
-
-    # print(row)
-
-    # Multiplied datasets will always include formatted string columns
-    # with the rightmost columns dedicated to formatted strings.
-    # Hence the rightmost column is the final formatted string column
-
-    # This is not optimal at all -- problem for future me ----------- #
-    # TODO: manage metadata for .parquet <> DataFrame
-    # trim and extract integer
-    total_stages = int(copy(row.columns[-1]).split('_')[-1]) + 1
-    bits         = (int(str(copy(row.columns[3])).split('_')[-1]) + 1) >> 1
-
-
-    # print(total_stages,  bits)
-    # --------------------------------------------------------------- #
+    import pyarrow.parquet as pq
+    from multiplied.io.parquet import import_metadata
+    from multiplied.core.truth import truth_layout, unpack_truth_frame
+    metadata = import_metadata(path)
+    names    = pq.read_schema(path).names
+    layout   = metadata.get('layout', truth_layout(names))
+    if 'stages' in metadata and 'bits' in metadata:
+        total_stages = metadata['stages']
+        bits         = metadata['bits']
+    else:
+        total_stages, bits = _infer_shape(names, layout)
 
     # loop through stages and push to DataFrame
 
     if stages == []:
         stages = [f"stage_{s}" for s in range(total_stages)]
 
+    # packed layout: read row values, unpack to bit columns
+    if layout == 'packed':
+        columns = [f"{s}_ppm_{p}_v" for s in stages for p in range(bits)]
+        return unpack_truth_frame(pd.read_parquet(path, columns=columns), width=bits << 1)
+
     columns = []
     for s in stages:
         for p in range(bits):
@@ -91,6 +118,30 @@ def pq_extract_stages(path: str, *, stages: list[str]=[]) -> pd.DataFrame:
 
 
 
+def _infer_shape(names: list[str], layout: str = 'bits') -> tuple[int, int]:
+    """
+    Return (stages, bits) from column names of .parquet exported without
+    metadata.
+    """
+    from multiplied.core.truth import truth_layout
+
+    # packed: "stage_{s}_ppm_{p}_v" and "_o" columns, one pair per row
+    if layout == 'packed':
+        fields = [
+            name.split('_') for name in names
+            if truth_layout([name]) == 'packed'
+        ]
+        total_stages = max(int(f[1]) for f in fields) + 1
+        bits         = max(int(f[3]) for f in fields) + 1
+        return total_stages, bits
+
+    # Multiplied datasets will always include formatted string columns
+    # with the rightmost columns dedicated to formatted strings.
+    # Hence the rightmost column is the final formatted string column
+    total_stages = int(copy(names[-1]).split('_')[-1]) + 1
+    bits         = (int(str(copy(names[3])).split('_')[-1]) + 1) >> 1
+    return total_stages, bits
+
 def pq_extract_formatted_all(path: str) -> pd.DataFrame:
     """Return DataFrame of all formatted strings from .parquet"""
     validate_path(path)
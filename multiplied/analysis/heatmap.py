@@ -1,76 +1,282 @@
-from copy import copy
+from functools import partial
+from typing import Any
 import pandas as pd
 import pyarrow as pa
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
+from multiplied import Algorithm, Scope
+from multiplied.core.truth import truth_layout
 
 
-def df_global_heatmap(path: str, title: str, df: pd.DataFrame, *, dark=False) -> None:
-    """Export pyplot of global heatmap"""
+def heatmap_tensor(df: pd.DataFrame, *, bits: int | None = None) -> np.ndarray:
+    """
+    Return (stages, bits, 2*bits) int64 tensor counting rows of truth table
+    df with each matrix cell set, for either column layout. Cell [s, p, x]
+    is stage s, ppm row p, matrix column x, that is result bit 2*bits-1-x.
+    Stages absent from df are left zero.
 
+    Bitwidth is inferred from ppm columns unless given.
+    """
     if not isinstance(df, pd.DataFrame):
         raise TypeError("df must be a pandas DataFrame")
+
+    names  = [name for name in df.columns if str(name).startswith('stage_')]
+    packed = truth_layout(names) == 'packed'
+    if packed:
+        names = [name for name in names if str(name).endswith('_v')]
+    if not names:
+        raise ValueError("No stage columns found")
+
+    fields = np.array([str(name).split('_') for name in names])
+    stage  = fields[:, 1].astype(np.int64)
+    ppm    = fields[:, 3].astype(np.int64)
+    if bits is None:
+        bits = int(ppm.max()) + 1 if packed else (int(fields[:, 5].astype(np.int64).max()) + 2) >> 1
+    width  = bits << 1
+    tensor = np.zeros((int(stage.max()) + 1, bits, width), dtype=np.int64)
+
+    if packed:
+        # count set bits of every row value column, one shift at a time
+        values = df[names].to_numpy(dtype=np.uint64)
+        for k in range(width):
+            tensor[stage, ppm, width-1-k] = (
+                (values >> np.uint64(k)) & np.uint64(1)
+            ).sum(axis=0, dtype=np.int64)
+        return tensor
+
+    k = fields[:, 5].astype(np.int64)
+    tensor[stage, ppm, width-1-k] = df[names].to_numpy().sum(axis=0, dtype=np.int64)
+    return tensor
+
+def _heatmap_tensor(data: 'pd.DataFrame | np.ndarray | HeatmapAccumulator') -> np.ndarray:
+    """Return data as heatmap tensor, see heatmap_tensor()"""
+    if isinstance(data, pd.DataFrame):
+        return heatmap_tensor(data)
+    if isinstance(data, HeatmapAccumulator):
+        return data.tensor
+    if not isinstance(data, np.ndarray):
+        raise TypeError(f"Expected pandas DataFrame or heatmap tensor got {type(data)}")
+    if data.ndim != 3 or data.shape[2] != data.shape[1] << 1:
+        raise ValueError(f"Expected (stages, bits, 2*bits) heatmap tensor, got shape {data.shape}")
+    return data
+
+
+
+class HeatmapAccumulator():
+    """
+    Running heatmap tensor, see heatmap_tensor(), of truth table rows seen
+    so far. Rows are added in batches, so memory is bounded by batch size
+    not table size. Accumulators of equal bitwidth add together.
+
+    >>> acc = HeatmapAccumulator()
+    >>> acc.add_parquet('8b_wallace.parquet')
+    >>> for batch in dataset.scan(stages=[0, 1, 2], arrow=True):
+    ...     acc.update(batch)
+    >>> mp.df_global_heatmap('heatmap.svg', title, acc)
+
+    Live truth_table() output requires stages, len(alg) + 1, as tables of
+    saturated algorithms or zero operands end early. Their last stage is
+    repeated, as in mp.truth_dataframe().
+    """
+
+    def __init__(self, *, bits: int | None = None, stages: int | None = None) -> None:
+        if bits is not None and (not isinstance(bits, int) or bits < 1):
+            raise ValueError(f"bits must be a positive integer, got {bits}")
+        if stages is not None and (not isinstance(stages, int) or stages < 1):
+            raise ValueError(f"stages must be a positive integer, got {stages}")
+        self.bits   = bits
+        self.stages = stages
+        self.rows   = 0
+        self._tensor: np.ndarray | None = None
+
+    def __repr__(self) -> str:
+        return f"HeatmapAccumulator(bits={self.bits}, stages={self.stages}, rows={self.rows})"
+
+    @property
+    def tensor(self) -> np.ndarray:
+        """Accumulated (stages, bits, 2*bits) tensor"""
+        if self._tensor is None:
+            if self.bits is None or self.stages is None:
+                raise ValueError("No data accumulated")
+            self._tensor = np.zeros((self.stages, self.bits, self.bits << 1), dtype=np.int64)
+        return self._tensor
+
+    # -- update -----------------------------------------------------
+
+    def update(self, data: Any) -> 'HeatmapAccumulator':
+        """
+        Add rows of a truth table DataFrame, pyarrow RecordBatch or Table,
+        a truth_table() stage dict, a ((a, b), stages) pair as yielded by
+        mp.parallel_truth_table(), a heatmap tensor or another accumulator.
+        """
+        if isinstance(data, pd.DataFrame):
+            self._add(heatmap_tensor(data, bits=self.bits), len(data))
+        elif isinstance(data, (pa.RecordBatch, pa.Table)):
+            names = [name for name in data.schema.names if _is_count_column(name)]
+            self._add(heatmap_tensor(data.select(names).to_pandas(), bits=self.bits), data.num_rows)
+        elif isinstance(data, dict):
+            self._add_truth(data)
+        elif isinstance(data, tuple) and len(data) == 2 and isinstance(data[1], dict):
+            self._add_truth(data[1])
+        elif isinstance(data, HeatmapAccumulator):
+            if data._tensor is not None:
+                self._add(data._tensor, data.rows)
+        elif isinstance(data, np.ndarray):
+            self._add(_heatmap_tensor(data), 0)
+        else:
+            raise TypeError(f"Unsupported heatmap data {type(data)}")
+        return self
+
+    def add_parquet(self, path: str, *, batch_size: int = 65536) -> 'HeatmapAccumulator':
+        """Add every row of .parquet truth table, read in batches of stage columns"""
+        import pyarrow.parquet as pq
+        from multiplied.io.parquet import import_parquet, import_metadata
+
+        if self.bits is None:
+            self.bits = import_metadata(path).get('bits')
+        names   = pq.read_schema(path).names
+        columns = [name for name in names if _is_count_column(name)]
+        for batch in import_parquet(path, batch_size, columns=columns, arrow=True):
+            self.update(batch)
+        return self
+
+    def __iadd__(self, other: 'HeatmapAccumulator | np.ndarray') -> 'HeatmapAccumulator':
+        return self.update(other)
+
+    def __add__(self, other: 'HeatmapAccumulator | np.ndarray') -> 'HeatmapAccumulator':
+        result = HeatmapAccumulator(bits=self.bits, stages=self.stages)
+        return result.update(self).update(other)
+
+    def _add_truth(self, truth: dict[int, Any]) -> None:
+        if self.stages is None:
+            raise ValueError("stages must be given to accumulate truth_table() output")
+        layers = []
+        for stage in range(self.stages):
+            matrix = truth.get(stage, truth[len(truth)-1])
+            layers.append("".join("".join(row) for row in matrix.matrix))
+        cells = np.frombuffer("".join(layers).encode(), dtype=np.uint8) == ord('1')
+        bits  = matrix.bits
+        self._add(cells.reshape(self.stages, bits, bits << 1).astype(np.int64), 1)
+
+    def _add(self, tensor: np.ndarray, rows: int) -> None:
+        if self.bits is None:
+            self.bits = tensor.shape[1]
+        if tensor.shape[1:] != (self.bits, self.bits << 1):
+            raise ValueError(
+                f"Expected heatmap of {self.bits}-bit table, got shape {tensor.shape}"
+            )
+        stages = max(tensor.shape[0], self.stages or 0)
+        if self._tensor is None or self._tensor.shape[0] < stages:
+            grown = np.zeros((stages, self.bits, self.bits << 1), dtype=np.int64)
+            if self._tensor is not None:
+                grown[:self._tensor.shape[0]] = self._tensor
+            self._tensor = grown
+        self.stages = stages
+        self._tensor[:tensor.shape[0]] += tensor
+        self.rows += rows
+
+def _is_count_column(name: str) -> bool:
+    """Stage bit or packed value column, see heatmap_tensor()"""
+    return name.startswith('stage_') and not name.endswith('_o')
+
+
+
+def heatmap_counts(scope: Scope, alg: Algorithm, *,
+    processes: int | None = None,
+    shards: int | None = None,
+    batch_size: int = 16384,
+) -> HeatmapAccumulator:
+    """
+    Return HeatmapAccumulator of every operand pair in scope, without
+    building a truth table. Scope is split into shards, each evaluated
+    and counted by a worker process, and worker counts are summed.
+
+    Up to 32-bits shards are evaluated in batches by Algorithm.exec_batch(),
+    wider algorithms pair by pair.
+
+    Options:
+        processes: Number of worker processes, None for every core,
+            1 evaluates in this process
+        shards: Number of shards, defaults to four per process
+        batch_size: Number of operand pairs evaluated per batch
+    """
+    import os
+    from multiprocessing import Pool
+    from multiplied.core.truth import _init_worker
+
+    if not isinstance(scope, Scope):
+        raise TypeError(f"Expected Scope instance got {type(scope)}")
+    if not isinstance(alg, Algorithm):
+        raise TypeError(f"Expected Algorithm instance got {type(alg)}")
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+    if shards is None:
+        shards = (processes or os.cpu_count() or 1) << 2
+    if not isinstance(shards, int) or shards < 1:
+        raise ValueError(f"shards must be a positive integer, got {shards}")
+
+    # compile a detached copy, leaving source algorithm untouched
+    alg = alg.detach()
+    if alg.plan is None:
+        alg.compile()
+
+    acc   = HeatmapAccumulator(bits=alg.bits, stages=len(alg) + 1)
+    tasks = scope.shards(min(shards, max(scope.size, 1)))
+    if processes == 1:
+        for shard in tasks:
+            acc.update(_shard_counts(shard, alg, batch_size))
+        return acc
+
+    with Pool(processes, initializer=_init_worker, initargs=(alg,)) as pool:
+        for counts in pool.imap_unordered(partial(_heatmap_shard_worker, batch_size=batch_size), tasks):
+            acc.update(counts)
+        pool.close()
+        pool.join()
+    return acc
+
+def _heatmap_shard_worker(shard: Scope, batch_size: int) -> HeatmapAccumulator:
+    """Pool task: heatmap counts of shard, using the worker algorithm"""
+    from multiplied.core import truth
+    return _shard_counts(shard, truth._worker_alg, batch_size)
+
+def _shard_counts(shard: Scope, alg: Algorithm, batch_size: int) -> HeatmapAccumulator:
+    acc   = HeatmapAccumulator(bits=alg.bits, stages=len(alg) + 1)
+    width = alg.bits << 1
+    if 32 < alg.bits:
+        for a, b in shard:
+            acc.update(alg.exec(a=a, b=b))
+        return acc
+
+    for a, b in shard.batches(batch_size):
+        stages = alg.exec_batch(a, b, packed=True)
+        tensor = np.zeros((len(stages), alg.bits, width), dtype=np.int64)
+        for s, values in stages.items():
+            for k in range(width):
+                tensor[s, :, width-1-k] = (
+                    (values >> np.uint64(k)) & np.uint64(1)
+                ).sum(axis=0, dtype=np.int64)
+        acc.update(tensor)
+        acc.rows += len(a)
+    return acc
+
+def df_global_heatmap(path: str, title: str, df: 'pd.DataFrame | np.ndarray | HeatmapAccumulator', *, dark=False) -> None:
+    """
+    Export pyplot of global heatmap, summed over every stage, from truth
+    table df, its heatmap tensor or a mp.HeatmapAccumulator
+    """
+
     if not isinstance(title, str):
         raise TypeError(f"title must be a string got {type(title)}")
     if not isinstance(path, str):
         raise TypeError(f"path must be a string got {type(path)}")
-
-
-    rbi = 0
-    tsi = -1
-    print('----df----')
-    print(df.columns)
-    print(df.index)
-    print('----df----\n')
-    while df.columns[tsi][:5] != 'stage':
-        print(df.columns[tsi][:5])
-        if 15 < tsi:
-            raise IndexError("Unsupported DataFrame")
-        tsi -= 1
-
-    while df.columns[rbi][:5] != 'stage':
-        if 15 < tsi:
-            raise IndexError("Unsupported DataFrame")
-        rbi += 1
-
-    col = list(df.columns)[rbi:tsi+1] if tsi != -1 else list(df.columns)[rbi:]
-    df_ = df[col].sum(axis=0)
-
-    print('----df_----')
-    print(f"{df_.head()}\n...\n{df_.tail()}")
-    print(df_.index)
-    print(tsi, rbi, f"\n{col[:5]}\n...\n{col[-5:]}\n")
-    df_ = pd.DataFrame([df_.values], columns=col)
-    print(df_)
-    # df_ = pd.DataFrame(df_, columns=col[rbi:tsi]) # Create heatmap for each stage
-    pd.set_option('display.max_rows', None)
-
-    print(df_.columns)
-    print('----df_----\n')
-
-    print('2d')
-    result_bits  = int(str(copy(df_.columns[0])).split('_')[-1]) + 1
-    total_stages = int(str(copy(df_.columns[-1])).split('_')[1]) + 1
-    print(result_bits, total_stages)
-
-    arr = None
-    for s in range(total_stages):
-        ppm = []
-        for p in range(result_bits >> 1):
-            row = [0]*(result_bits)
-            for b in range((result_bits)-1, -1, -1):
-                row[b] = df_.loc[:, f"stage_{s}_ppm_{p}_b_{b}"][0]
-            ppm.append(row[::-1])
-        if arr is None:
-            arr = np.array(ppm)
-            continue
-        arr += np.array(ppm) # Unify all heatmaps
-
-    print(arr)
-    if arr is None:
+    tensor = _heatmap_tensor(df)
+    if not tensor.size:
         raise ValueError("No data found")
 
+    arr         = tensor.sum(axis=0) # Unify all heatmaps
+    result_bits = tensor.shape[2]
+
     cmap = 'magma_r'
     if dark:
         plt.style.use('dark_background')
@@ -96,76 +302,28 @@ def df_global_heatmap(path: str, title: str, df: pd.DataFrame, *, dark=False) ->
     fig.tight_layout()
     plt.colorbar(im, shrink=0.7)
     plt.savefig(path)
-
-    print('----\n2d heatmap done\n----')
     return None
 
-def df_global_3d_heatmap(path: str, title: str, df: pd.DataFrame, *, dark=False) -> None:
-    """Export 3d plot with heatmap for each stage stacked along the x-axis"""
+def df_global_3d_heatmap(path: str, title: str, df: 'pd.DataFrame | np.ndarray | HeatmapAccumulator', *, dark=False) -> None:
+    """
+    Export 3d plot with heatmap for each stage stacked along the x-axis,
+    from truth table df, its heatmap tensor or a mp.HeatmapAccumulator
+    """
 
-    if not isinstance(df, pd.DataFrame):
-        raise TypeError("df must be a pandas DataFrame")
     if not isinstance(title, str):
         raise TypeError(f"title must be a string got {type(title)}")
     if not isinstance(path, str):
         raise TypeError(f"path must be a string got {type(path)}")
 
     # -- collect data, metadata -------------------------------------
+    stages       = _heatmap_tensor(df)
+    total_stages = stages.shape[0]
+    result_bits  = stages.shape[2]
+    if not stages.size:
+        raise ValueError("No data found")
 
-    rbi = 0
-    tsi = -1
-    print('----df----')
-    print(df.columns)
-    print(df.index)
-    print('----df----\n')
-    while df.columns[tsi][:5] != 'stage':
-        print(df.columns[tsi][:5])
-        if 15 < tsi:
-            raise IndexError("Unsupported DataFrame")
-        tsi -= 1
-
-    while df.columns[rbi][:5] != 'stage':
-        if 15 < tsi:
-            raise IndexError("Unsupported DataFrame")
-        rbi += 1
-
-    col = list(df.columns)[rbi:tsi+1] if tsi != -1 else list(df.columns)[rbi:]
-    df_ = df[col].sum(axis=0)
-
-    print('----df_----')
-    print(f"{df_.head()}\n...\n{df_.tail()}")
-    print(df_.index)
-    print(tsi, rbi, f"\n{col[:5]}\n...\n{col[-5:]}\n")
-    df_ = pd.DataFrame([df_.values], columns=col)
-    print(df_)
-    # df_ = pd.DataFrame(df_, columns=col[rbi:tsi]) # Create heatmap for each stage
-    pd.set_option('display.max_rows', None)
-
-    print(df_.columns)
-    print('----df_----\n')
-
-    print('3d')
-    result_bits  = int(str(copy(df_.columns[0])).split('_')[-1]) + 1
-    total_stages = int(str(copy(df_.columns[-1])).split('_')[1]) + 1
-    print(result_bits, total_stages)
-
-    # -- build stage heatmaps ---------------------------------------
-    arr_list = []
-    for s in range(total_stages):
-        ppm = []
-        for p in range(result_bits >> 1):
-            row = [0]*(result_bits)
-            for b in range(result_bits):
-                row[b] = df_.loc[:, f"stage_{s}_ppm_{p}_b_{b}"][0]
-            ppm.append(row[::-1])
-        arr_list.append(ppm)
-
-
-    stages      = np.stack(arr_list)
-    print(stages.shape)
     vmin, vmax  = stages.min(), stages.max()
-    stages_norm = (stages - vmin) / (vmax - vmin)
-    print(stages_norm.shape)
+    stages_norm = (stages - vmin) / ((vmax - vmin) or 1)
     _, nx, ny   = stages_norm.shape
 
 
@@ -242,72 +400,113 @@ def df_global_3d_heatmap(path: str, title: str, df: pd.DataFrame, *, dark=False)
 
 
 
-def df_stage_heatmap(path: str, df: pd.DataFrame, stages: list[int]) -> None:
-    """Export pyplot heatmap for each selected stage"""
+def df_stage_heatmap(
+    path: str,
+    df: 'pd.DataFrame | np.ndarray | HeatmapAccumulator',
+    stages: list[int],
+    *,
+    title: str = '',
+    dark: bool = False,
+) -> None:
+    """
+    Export grid of pyplot heatmaps, one per selected stage, from truth table
+    df, its heatmap tensor or a mp.HeatmapAccumulator. Empty stages selects
+    every stage. Stages share one colour scale.
+    """
+    tensor = _heatmap_tensor(df)
+    stages = _validate_stages(stages, tensor)
+    _stage_grid(path, tensor, stages, title=title, dark=dark)
 
+
+def df_stage_bound_heatmap(
+    path: str,
+    df: 'pd.DataFrame | np.ndarray | HeatmapAccumulator',
+    stages: list[int],
+    bound: list[tuple[int, int]],
+    *,
+    title: str = '',
+    dark: bool = False,
+) -> None:
+    """
+    Export pyplot heatmap of bounding box region across stages, see
+    df_stage_heatmap(). Bound is a list of (x, y) matrix coordinates, as
+    returned per unit by Template.find_bounding_box(), and the region is
+    the smallest box containing all of them.
+
+    >>> bounds = alg.algorithm[0]['template'].find_bounding_box()
+    >>> df_stage_bound_heatmap(path, acc, [0, 1], bounds['A'])
+    """
+    tensor = _heatmap_tensor(df)
+    stages = _validate_stages(stages, tensor)
+    if not isinstance(bound, list) or not bound:
+        raise TypeError("bound must be a non-empty list of (x, y) tuples")
+    if not all(isinstance(c, tuple) and len(c) == 2 and all(isinstance(i, int) for i in c) for c in bound):
+        raise TypeError("All elements of bound must be (x, y) tuples of integers")
+
+    xs = [x for x, _ in bound]
+    ys = [y for _, y in bound]
+    _, rows, width = tensor.shape
+    if min(xs) < 0 or width <= max(xs) or min(ys) < 0 or rows <= max(ys):
+        raise ValueError(f"bound exceeds {rows}x{width} matrix: {bound}")
+    box = (min(xs), min(ys), max(xs), max(ys))
+    _stage_grid(path, tensor, stages, title=title, dark=dark, box=box)
+
+
+def _validate_stages(stages: list[int], tensor: np.ndarray) -> list[int]:
     if not isinstance(stages, list):
         raise TypeError(f"Expected list[int] got {type(stages)}")
     if not all([isinstance(i, int) for i in stages]):
         raise TypeError("All elements of stages must be integers")
-    # sum all columns
-    # cast to nested list
-    # cast nested list to .im_show
-    # Use columns as hints to generate axis labels
-    # plt.savefig('filename.png')
-
-    # print(df)
-    df_ = df.sum(axis=0)
-    rbi = 0
-    tsi = -1
-    while df_.columns[tsi][:5] != 'stage':
-        if 15 < tsi:
-            raise IndexError("Unsupported DataFrame")
-        tsi -= 1
-
-    while df_.columns[rbi][:5] != 'stage':
-        if 15 < tsi:
-            raise IndexError("Unsupported DataFrame")
-        rbi += 1
-
-
-    print('boo')
-    bits  = (int(str(copy(df_.columns[rbi])).split('_')[-1]) + 1) >> 1
-    total_stages = int(str(copy(df_.columns[tsi])).split('_')[1]) + 1
-
-    mini_heatmaps = []
-
-
-    if stages == []:
-        stages = [i for i in range(total_stages)]
-
-    for s in stages:
-        ppm = []
-        for p in range(bits):
-            row = [0]*(bits << 1)
-            for b in range((bits << 1)-1, -1, -1):
-                row[b] = df_.loc[f"('stage_{s}', 'ppm_{p}', 'b{b}')"]
-            ppm.append(row)
-        mini_heatmaps.append(ppm)
-
-
-
-
-
-
-    print(df_)
-    print(df_.index)
-    # print(mini_heatmaps)
-    # for i in df_:
-    #     print(i)
+    if not stages:
+        return list(range(tensor.shape[0]))
+    if not all(0 <= i < tensor.shape[0] for i in stages):
+        raise ValueError(f"Stages must be within 0..{tensor.shape[0] - 1}, got {stages}")
+    return stages
+
+def _stage_grid(path: str, tensor: np.ndarray, stages: list[int], *,
+    title: str,
+    dark: bool,
+    box: tuple[int, int, int, int] | None = None,
+) -> None:
+    """Render stages of tensor in a grid, cropped to box (x0, y0, x1, y1)"""
+    import math
 
+    if not isinstance(path, str):
+        raise TypeError(f"path must be a string got {type(path)}")
+    if not isinstance(title, str):
+        raise TypeError(f"title must be a string got {type(title)}")
 
+    width      = tensor.shape[2]
+    x0, y0, x1, y1 = box or (0, 0, width - 1, tensor.shape[1] - 1)
+    crop       = tensor[stages][:, y0:y1+1, x0:x1+1]
+    vmin, vmax = crop.min(), crop.max()
+    annotate   = crop[0].size <= 64
 
+    cmap = 'magma_r'
+    if dark:
+        plt.style.use('dark_background')
+        cmap = 'magma'
 
-def df_stage_bound_heatmap(
-    path: str,
-    df: pd.DataFrame,
-    stages: list[int],
-    bound: list[tuple[int, int]]
-) -> None:
-    """Export pyplot heatmap of bounding box region across stages"""
-    ...
+    cols = math.ceil(math.sqrt(len(stages)))
+    rows = math.ceil(len(stages) / cols)
+    fig, axes = plt.subplots(rows, cols, figsize=(16, 9), dpi=200, squeeze=False)
+    for ax, s, arr in zip(axes.flat, stages, crop):
+        im = ax.imshow(arr, cmap=cmap, vmin=vmin, vmax=vmax)
+        ax.set_xticks(range(x1 - x0 + 1), labels=[f'b{width-1-x}' for x in range(x0, x1+1)], fontsize=6)
+        ax.set_yticks(range(y1 - y0 + 1), labels=[f'ppm_{y}' for y in range(y0, y1+1)], fontsize=6)
+        ax.set_title(f'stage_{s}')
+        if annotate:
+            for i in range(arr.shape[0]):
+                for j in range(arr.shape[1]):
+                    dense = (arr[i, j] - vmin) * 2 > vmax - vmin
+                    ax.text(j, i, arr[i, j], ha="center", va="center",
+                        color="w" if dense != dark else "k", fontsize=6
+                    )
+    for ax in list(axes.flat)[len(stages):]:
+        ax.set_visible(False)
+
+    if title:
+        fig.suptitle(title)
+    fig.colorbar(im, ax=axes.ravel().tolist(), shrink=0.7)
+    plt.savefig(path)
+    plt.close(fig)
@@ -0,0 +1,361 @@
+#######################################
+# Benchmarks For Multiplier Hot Paths #
+#######################################
+
+"""
+Times core hot paths at given bitwidths and reports throughput in rows/s
+and peak traced memory. Results are saved as JSON and can be compared
+against a stored baseline to flag regressions.
+
+    python -m multiplied.bench --bits 4 8 --output before.json
+    python -m multiplied.bench --bits 4 8 --compare before.json
+
+Each benchmark times run() only, over fresh setup() state, and reports
+the best of --repeat runs. Peak memory is traced in one further run, as
+tracing slows execution.
+
+Pooled benchmarks, marked [pool], evaluate in a worker process: their
+time is wall-clock including pool startup and their peak memory covers
+the parent process only, so neither compares with in-process benchmarks.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+import multiplied as mp
+
+
+@dataclass
+class Benchmark:
+    """
+    Named hot path, run(setup()) processes rows operand pairs. Pooled
+    benchmarks run in worker processes, see module docstring.
+    """
+    name:  str
+    setup: Callable[[int, int], Any]
+    run:   Callable[[Any], Any]
+    max_bits: int = 64
+    pooled:   bool = False
+
+
+# -- benchmarks -----------------------------------------------------
+#
+# setup(bits, rows) returns state passed to run(), every benchmark
+# draws operands from the same seeded uniform sample.
+
+def _scope(bits: int, rows: int) -> mp.SampleScope:
+    return mp.SampleScope(bits, rows, method='uniform', seed=0)
+
+def _algorithm(bits: int) -> mp.Algorithm:
+    alg = mp.Algorithm(bits)
+    alg.auto_resolve_stage()
+    return alg
+
+def _setup_pairs(bits: int, rows: int) -> tuple[int, list[tuple[int, int]]]:
+    return bits, list(_scope(bits, rows))
+
+def _run_matrix(state: tuple[int, list[tuple[int, int]]]) -> None:
+    bits, pairs = state
+    for a, b in pairs:
+        mp.Matrix(bits, a=a, b=b)
+
+def _setup_exec(bits: int, rows: int, *, compiled: bool = False) -> tuple[mp.Algorithm, list]:
+    alg = _algorithm(bits)
+    if compiled:
+        alg.compile()
+    return alg, list(_scope(bits, rows))
+
+def _run_exec(state: tuple[mp.Algorithm, list[tuple[int, int]]]) -> None:
+    alg, pairs = state
+    for a, b in pairs:
+        alg.exec(a=a, b=b)
+
+def _setup_exec_batch(bits: int, rows: int) -> tuple[mp.Algorithm, Any, Any]:
+    import numpy as np
+
+    alg  = _algorithm(bits)
+    alg.compile()
+    a, b = zip(*_scope(bits, rows)) if rows else ((), ())
+    return alg, np.array(a, dtype=np.uint64), np.array(b, dtype=np.uint64)
+
+def _run_exec_batch(state: tuple[mp.Algorithm, Any, Any]) -> None:
+    alg, a, b = state
+    alg.exec_batch(a, b, packed=True)
+
+def _setup_auto_resolve(bits: int, rows: int) -> tuple[int, int]:
+    return bits, rows
+
+def _run_auto_resolve(state: tuple[int, int]) -> None:
+    bits, rows = state
+    for _ in range(rows):
+        mp.Algorithm(bits).auto_resolve_stage()
+
+def _setup_hoist(bits: int, rows: int) -> list[mp.Matrix]:
+    return [mp.Matrix(bits, a=a, b=b) for a, b in _scope(bits, rows)]
+
+def _run_hoist(matrices: list[mp.Matrix]) -> None:
+    from multiplied.core.algorithm import hoist
+    for matrix in matrices:
+        hoist(matrix)
+
+def _setup_dataframe(bits: int, rows: int) -> tuple[mp.Algorithm, mp.Scope]:
+    return _algorithm(bits), _scope(bits, rows)
+
+def _run_dataframe(state: tuple[mp.Algorithm, mp.Scope]) -> None:
+    alg, scope = state
+    mp.truth_dataframe(scope, alg, processes=1, layout='packed' if alg.bits <= 32 else 'bits')
+
+def _setup_export(bits: int, rows: int) -> tuple[mp.Algorithm, mp.Scope, str]:
+    path = os.path.join(tempfile.mkdtemp(prefix='multiplied_bench_'), 'table.parquet')
+    return _algorithm(bits), _scope(bits, rows), path
+
+def _run_export(state: tuple[mp.Algorithm, mp.Scope, str]) -> None:
+    alg, scope, path = state
+    mp.export_parquet(scope, alg, path, layout='packed') # removed by _cleanup()
+
+def _setup_extract(bits: int, rows: int) -> str:
+    alg, scope, path = _setup_export(bits, rows)
+    mp.export_parquet(scope, alg, path, layout='packed')
+    return path
+
+def _run_extract(path: str) -> None:
+    mp.pq_extract_stages(path)
+
+def _setup_heatmap(bits: int, rows: int) -> Any:
+    alg, scope = _setup_dataframe(bits, rows)
+    return mp.truth_dataframe(scope, alg, layout='packed')
+
+def _run_heatmap(df: Any) -> None:
+    mp.heatmap_tensor(df)
+
+def _run_heatmap_counts(state: tuple[mp.Algorithm, mp.Scope]) -> None:
+    alg, scope = state
+    mp.heatmap_counts(scope, alg, processes=1) # in process, no pool
+
+def _remove(path: str) -> None:
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+BENCHMARKS = {
+    b.name: b for b in [
+        Benchmark('matrix',         _setup_pairs,        _run_matrix),
+        Benchmark('exec',           _setup_exec,         _run_exec),
+        Benchmark('exec_compiled',  lambda bits, rows: _setup_exec(bits, rows, compiled=True), _run_exec),
+        Benchmark('exec_batch',     _setup_exec_batch,   _run_exec_batch,     max_bits=32),
+        Benchmark('auto_resolve',   _setup_auto_resolve, _run_auto_resolve),
+        Benchmark('hoist',          _setup_hoist,        _run_hoist),
+        Benchmark('truth_dataframe', _setup_dataframe,   _run_dataframe,      pooled=True),
+        Benchmark('export_parquet', _setup_export,       _run_export,         max_bits=32),
+        Benchmark('extract_stages', _setup_extract,      _run_extract,        max_bits=32),
+        Benchmark('heatmap_tensor', _setup_heatmap,      _run_heatmap,        max_bits=32),
+        Benchmark('heatmap_counts', _setup_dataframe,    _run_heatmap_counts),
+    ]
+}
+
+# rows per benchmark are scaled down for slow, per algorithm benchmarks
+ROW_SCALE = {'auto_resolve': 1/256}
+
+
+# -- measure --------------------------------------------------------
+
+def measure(benchmark: Benchmark, bits: int, rows: int, *, repeat: int = 3) -> dict[str, Any]:
+    """
+    Return {'rows', 'seconds', 'rows_per_s', 'peak_bytes', 'pooled'} of
+    benchmark at bits, seconds being the best of repeat runs.
+    """
+    if not isinstance(repeat, int) or repeat < 1:
+        raise ValueError(f"repeat must be a positive integer, got {repeat}")
+    rows = max(1, int(rows * ROW_SCALE.get(benchmark.name, 1)))
+
+    best = float('inf')
+    for _ in range(repeat):
+        state = benchmark.setup(bits, rows)
+        start = time.perf_counter()
+        benchmark.run(state)
+        best  = min(best, time.perf_counter() - start)
+        _cleanup(state)
+
+    state = benchmark.setup(bits, rows)
+    tracemalloc.start()
+    try:
+        benchmark.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        _cleanup(state)
+
+    return {
+        'rows':       rows,
+        'seconds':    best,
+        'rows_per_s': rows / best if best else float('inf'),
+        'peak_bytes': peak,
+        'pooled':     benchmark.pooled,
+    }
+
+def _cleanup(state: Any) -> None:
+    """Remove temporary .parquet files left by setup()"""
+    paths = state if isinstance(state, tuple) else (state,)
+    for path in paths:
+        if isinstance(path, str) and os.path.exists(path):
+            _remove(path)
+
+def run(bits: list[int], *,
+    rows: int = 2048,
+    repeat: int = 3,
+    only: list[str] | None = None,
+    echo: Callable[[str], Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Run benchmarks, every one unless only names some, at each bitwidth.
+    Results are keyed "{name}/{bits}", benchmarks unsupported at a
+    bitwidth are skipped.
+    """
+    names = list(BENCHMARKS) if only is None else only
+    for name in names:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark {name!r}, expected one of {list(BENCHMARKS)}")
+    for b in bits:
+        mp.validate_bitwidth(b)
+
+    results = {}
+    for b in bits:
+        for name in names:
+            if BENCHMARKS[name].max_bits < b:
+                continue
+            key = f"{name}/{b}"
+            results[key] = measure(BENCHMARKS[name], b, rows, repeat=repeat)
+            if echo is not None:
+                echo(_format_row(key, results[key]))
+    return {'meta': _meta(rows, repeat), 'results': results}
+
+def _meta(rows: int, repeat: int) -> dict[str, Any]:
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        package = version('multiplied')
+    except PackageNotFoundError:
+        package = None
+    return {
+        'version':  package,
+        'python':   platform.python_version(),
+        'platform': platform.platform(),
+        'cpus':     os.cpu_count(),
+        'time':     time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'rows':     rows,
+        'repeat':   repeat,
+    }
+
+
+# -- compare --------------------------------------------------------
+
+def load(path: str) -> dict[str, Any]:
+    """Return results saved with --output, raising ValueError if malformed"""
+    with open(path) as f:
+        try:
+            results = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path} is not valid JSON: {e}") from None
+    entries = results.get('results') if isinstance(results, dict) else None
+    if not isinstance(entries, dict) or not all(
+        isinstance(entry, dict) and {'rows_per_s', 'peak_bytes'} <= entry.keys()
+        for entry in entries.values()
+    ):
+        raise ValueError(f"{path} is not a benchmark results file")
+    return results
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], *,
+    threshold: float = 0.1,
+) -> list[dict[str, Any]]:
+    """
+    Return comparison of every benchmark in both results. A benchmark has
+    regressed if its throughput dropped, or peak memory grew, by more than
+    threshold, a fraction of the baseline.
+    """
+    if not 0 <= threshold:
+        raise ValueError(f"threshold must be non-negative, got {threshold}")
+    rows = []
+    for key, new in current['results'].items():
+        if (old := baseline['results'].get(key)) is None:
+            continue
+        speed  = new['rows_per_s'] / old['rows_per_s']
+        memory = new['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 1.0
+        rows.append({
+            'benchmark': key,
+            'speed':     speed,
+            'memory':    memory,
+            'regressed': speed < 1 - threshold or 1 + threshold < memory,
+            'pooled':    new.get('pooled', False),
+        })
+    return rows
+
+
+# -- cli ------------------------------------------------------------
+
+def _format_row(key: str, result: dict[str, Any]) -> str:
+    return (
+        f"{key:<24} {result['rows_per_s']:>14,.0f} rows/s "
+        f"{result['peak_bytes'] / 2**20:>10.2f} MiB peak"
+        f"{'  [pool]' if result.get('pooled') else ''}"
+    )
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m multiplied.bench',
+        description='Benchmark multiplied hot paths.',
+    )
+    parser.add_argument('--bits', type=int, nargs='+', default=[4, 8],
+        help='bitwidths to benchmark (default: 4 8)')
+    parser.add_argument('--rows', type=int, default=2048,
+        help='operand pairs per benchmark (default: 2048)')
+    parser.add_argument('--repeat', type=int, default=3,
+        help='timed runs per benchmark, best is kept (default: 3)')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), metavar='NAME',
+        help=f"benchmarks to run, any of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--output', metavar='PATH',
+        help='save results as JSON')
+    parser.add_argument('--compare', metavar='PATH',
+        help='compare against baseline JSON, exit 1 on regression')
+    parser.add_argument('--threshold', type=float, default=0.1,
+        help='regression threshold as a fraction of baseline (default: 0.1)')
+    args = parser.parse_args(argv)
+
+    if args.rows < 1:
+        parser.error('--rows must be a positive integer')
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load(args.compare)
+        except (OSError, ValueError) as e:
+            parser.error(f"--compare: {e}")
+    try:
+        results = run(args.bits, rows=args.rows, repeat=args.repeat, only=args.only, echo=print)
+    except ValueError as e:
+        parser.error(str(e))
+    if any(result['pooled'] for result in results['results'].values()):
+        print('[pool]: wall-clock including pool startup, parent process memory only')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is None:
+        return 0
+    regressed = False
+    print(f"\n{'benchmark':<24} {'speed':>8} {'memory':>8}")
+    for row in compare(baseline, results, threshold=args.threshold):
+        regressed |= row['regressed']
+        flag = ('  [pool]' if row['pooled'] else '') + ('  REGRESSED' if row['regressed'] else '')
+        print(f"{row['benchmark']:<24} {row['speed']:>7.2f}x {row['memory']:>7.2f}x{flag}")
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,6 +2,8 @@
 # Algorithm Defined By Templates and Maps #
 ###########################################
 
+from collections import OrderedDict
+from time import perf_counter
 from copy import deepcopy
 from typing import Any, Iterable
 import multiplied as mp
@@ -19,27 +21,38 @@ class Algorithm():
     matrix : mp.Matrix
         The matrix to be multiplied.
 
+    packed : bool
+        Build matrices in exec() using packed integer rows, see mp.Matrix.
+
     ...
     """
 
-    def __init__(self, bits: int,*, matrix: Any=None, saturation: bool=False, dadda=False) -> None:
+    def __init__(self, bits: int,*, matrix: Any=None, saturation: bool=False, dadda=False,
+        packed: bool=False,
+    ) -> None:
 
         mp.validate_bitwidth(bits)
         if not isinstance(dadda, bool):
             raise TypeError(f"Expected dadda: bool, got {type(dadda)}")
         if not isinstance(saturation, bool):
             raise TypeError(f"Expected saturation: bool, got {type(saturation)}")
+        if not isinstance(packed, bool):
+            raise TypeError(f"Expected packed: bool, got {type(packed)}")
         if matrix is not None:
             if not isinstance(matrix, mp.Matrix):
                 raise TypeError(f"Expected Matrix, got {type(matrix)}")
             self.matrix = matrix
         else:
-            self.matrix = mp.Matrix(bits)
+            self.matrix = mp.Matrix(bits, packed=packed)
 
         self.bits       = bits
+        self.packed     = packed
         self.dadda      = dadda
         self.state      = 0
         self.algorithm  = {}
+        self.plan       = None
+        self._profile   = None
+        self._rows      = {} # occupied rows of each stage's pseudo result
         if self.dadda:
             hoist(self.matrix)
         self.saturation = saturation
@@ -105,6 +118,8 @@ class Algorithm():
             'map': map_,
         }
         self.algorithm[stage_index] = stage
+        self._rows[stage_index] = self.bits - mp.empty_rows(result)
+        self.plan = None # compiled plan no longer matches algorithm
         return None
 
     def __clamp_bitwidth(self) -> bool:
@@ -112,10 +127,20 @@ class Algorithm():
         Saturates matrix if current matrix has carried past original bitwidth
         """
         boundary = (2**self.bits)-1
-        as_int   = mp.to_int_matrix(self.matrix.matrix)
+        if self.matrix.packed:
+            as_int = self.matrix.values
+        else:
+            as_int = mp.to_int_matrix(self.matrix.matrix)
         test     = [boundary < i for i in as_int]
 
-        if any(test):
+        if any(test) and self.matrix.packed:
+            occupancy    = [0] * self.bits
+            values       = [0] * self.bits
+            occupancy[0] = (1 << (self.bits << 1)) - 1
+            values[0]    = boundary
+            self.matrix  = mp.Matrix.from_packed(occupancy, values)
+            return True
+        elif any(test):
             # flood bits within boundary
             saturated_value = [['0']*self.bits + ['1']*self.bits]
             self.matrix = mp.Matrix(saturated_value + mp.empty_matrix(self.bits)[1:])
@@ -163,6 +188,9 @@ class Algorithm():
         #   conflicts dynamically before merging vs doing so once via the
         #   resultant template
         bounds: dict = self.algorithm[self.state]['template'].bounds
+        if self.matrix.packed:
+            return self.__reduce_packed(bounds)
+
         # -- reduce -------------------------------------------------
         n         = self.bits << 1
         results   = {}
@@ -250,15 +278,10 @@ class Algorithm():
                             output[0][i]   = '1' if csa_sum & 1 else '0'
                             continue
 
-                        # -- brute force index 0 --------------------
-                        # ! remove try catch:
-                        # ! handle index zero outside of loop
-                        # ! unit may not even overlap index 0
-                        try:
-                            output[0][i]   = '1' if csa_sum & 1 else '0'
+                        # -- carry past index 0 is dropped -----------
+                        output[0][i] = '1' if csa_sum & 1 else '0'
+                        if 0 < i:
                             output[1][i-1] = '1' if csa_sum & 2 else '0'
-                        except IndexError:
-                            continue
                 case _:
                     raise ValueError(f"Unsupported unit type, len={bounds[ch][-1][1] - bounds[ch][0][1]}")
 
@@ -305,20 +328,291 @@ class Algorithm():
         # This functionality to be implemented at a later date.
 
         # -- merge --------------------------------------------------
+        profile = self._profile
+        if profile is not None:
+            start = perf_counter()
         if 1 < len(results):
             self.matrix = mp.matrix_merge(results, bounds)
         else:
             self.matrix = list(results.values())[0]
 
         # -- map ----------------------------------------------------
+        if profile is not None:
+            profile['merge'] += (split := perf_counter()) - start
+        self.matrix.apply_map(self.algorithm[self.state]['map'])
+        if profile is not None:
+            profile['map'] += perf_counter() - split
+        self.state += 1
+
+
+        return None
+
+    def __reduce_packed(self, bounds: dict[str, list[tuple[int, int]]]) -> None:
+        """
+        Packed equivalent of __reduce(). Units operate on whole rows:
+
+        >>> NOOP: row
+        >>> ADD : row_a + row_b
+        >>> CSA : row_a ^ row_b ^ row_c, majority(row_a, row_b, row_c) << 1
+        """
+        n         = self.bits << 1
+        occupancy = self.matrix.occupancy
+        values    = self.matrix.values
+        results   = {}
+        chars = list(bounds.keys())
+        chars.remove('_')
+        for ch in chars:
+            base_index = bounds[ch][0][1]
+            height     = bounds[ch][-1][1] - bounds[ch][0][1] + 1
+            unit_occ   = [0] * self.bits
+            unit_val   = [0] * self.bits
+            if not 1 <= height <= 3:
+                raise ValueError(f"Unsupported unit type, len={height-1}")
+
+            rows = slice(base_index, base_index+height)
+            output_occ = unit_occupancy(occupancy[rows], n)
+            output_val = unit_values(values[rows], output_occ)
+            for i, (occ, val) in enumerate(zip(output_occ, output_val)):
+                unit_occ[base_index+i] = occ
+                unit_val[base_index+i] = val
+            results[ch] = mp.Matrix.from_packed(unit_occ, unit_val)
+
+        # -- merge --------------------------------------------------
+        profile = self._profile
+        if profile is not None:
+            start = perf_counter()
+        if 1 < len(results):
+            self.matrix = mp.matrix_merge(results, bounds)
+        else:
+            self.matrix = list(results.values())[0]
 
+        # -- map ----------------------------------------------------
+        if profile is not None:
+            profile['merge'] += (split := perf_counter()) - start
         self.matrix.apply_map(self.algorithm[self.state]['map'])
+        if profile is not None:
+            profile['map'] += perf_counter() - split
         self.state += 1
+        return None
 
+    def compile(self, *, cache: int = 0) -> None:
+        """
+        Resolve templates, bounds and maps of every stage into a fixed list
+        of operations on packed rows. exec() runs these operations, skipping
+        templates entirely, until the algorithm is modified.
+
+        >>> self.plan = {
+        >>>     "start"     : [(source_row, destination_row, mask), ...],
+        >>>     "occupancy" : [mask, ...],
+        >>>     "stages"    : [(units, row_order, moves, occupancy), ...],
+        >>>     "touched"   : [(row, ...), ...],
+        >>>     "cache"     : None | {"maxsize", "stages", "hits", "misses"}}
+        >>>
+        >>> units = [(height, base_row, sum_mask, carry_mask), ...]
+
+        Operand independent: only the occupancy of each row is needed to
+        place every bit, so every stage is resolved once from an empty matrix.
 
+        Options:
+            cache: Keep up to cache outputs per stage, least recently used
+                first out, keyed by the values of rows the stage's units
+                read. See cache_info()
+        """
+        if not isinstance(cache, int) or cache < 0:
+            raise ValueError(f"cache must be a non-negative integer, got {cache}")
+        n         = self.bits << 1
+        row_mask  = (1 << n) - 1
+        matrix    = mp.Matrix(self.bits, packed=True)
+        start     = hoist(matrix).moves() if self.dadda else []
+        occupancy = list(matrix.occupancy)
+        plan      = {'start': start, 'occupancy': occupancy, 'stages': [], 'touched': []}
+
+        for stage in self.algorithm.values():
+            bounds = stage['template'].bounds
+            chars  = [ch for ch in bounds.keys() if ch != '_']
+            masks  = mp.merge_masks(bounds, self.bits)
+            units  = []
+            output = [0] * self.bits
+            for ch in chars:
+                base_index = bounds[ch][0][1]
+                height     = bounds[ch][-1][1] - bounds[ch][0][1] + 1
+                if not 1 <= height <= 3:
+                    raise ValueError(f"Unsupported unit type, len={height-1}")
+                unit_occ = unit_occupancy(occupancy[base_index:base_index+height], n)
+                unit_occ = [
+                    occ & (masks[ch].get(base_index+i, 0) if 1 < len(chars) else row_mask)
+                    for i, occ in enumerate(unit_occ)
+                ]
+                for i, occ in enumerate(unit_occ):
+                    output[base_index+i] = occ
+                units.append((height, base_index, unit_occ[0], unit_occ[1] if height == 3 else 0))
+
+            # -- map ------------------------------------------------
+            order, moves = None, None
+            if stage['map'].rmap:
+                order  = stage['map'].row_order()
+                output = [output[i] for i in order]
+            else:
+                moves  = stage['map'].moves()
+                output = mp.Matrix.from_packed(output, [0] * self.bits)
+                output.apply_map(stage['map'])
+                output = output.occupancy
+
+            plan['stages'].append((units, order, moves, output))
+            plan['touched'].append(tuple(
+                y + i for height, y, _, _ in units for i in range(height)
+            ))
+            occupancy = output
+
+        plan['cache'] = None
+        if cache:
+            stages = len(plan['stages'])
+            plan['cache'] = {
+                'maxsize' : cache,
+                'stages'  : [OrderedDict() for _ in range(stages)],
+                'hits'    : [0] * stages,
+                'misses'  : [0] * stages,
+            }
+        self.plan = plan
         return None
 
+    def cache_info(self) -> dict[str, Any]:
+        """
+        Return hit, miss and size counters of the compiled stage cache,
+        totals and per stage, see compile(cache=...)
 
+        >>> {'hits': int, 'misses': int, 'maxsize': int, 'currsize': int,
+        >>>  'stages': [(hits, misses, currsize), ...]}
+        """
+        if self.plan is None or self.plan['cache'] is None:
+            return {'hits': 0, 'misses': 0, 'maxsize': 0, 'currsize': 0, 'stages': []}
+        cache  = self.plan['cache']
+        stages = [
+            (hits, misses, len(entries))
+            for hits, misses, entries in zip(cache['hits'], cache['misses'], cache['stages'])
+        ]
+        return {
+            'hits'     : sum(cache['hits']),
+            'misses'   : sum(cache['misses']),
+            'maxsize'  : cache['maxsize'],
+            'currsize' : sum(len(entries) for entries in cache['stages']),
+            'stages'   : stages,
+        }
+
+    def profile(self, enable: bool = True) -> None:
+        """
+        Enable, resetting counters, or disable profiling of exec(), see
+        profile_info(). Disabled profiling costs a None check per stage.
+        """
+        if not isinstance(enable, bool):
+            raise TypeError(f"Expected enable: bool, got {type(enable)}")
+        self._profile = _empty_profile() if enable else None
+        return None
+
+    def profile_info(self) -> dict[str, Any]:
+        """
+        Return exec() counters and cumulative seconds since profiling was
+        enabled, see profile(). Compiled plans fuse merge and map into the
+        stage, so only uncompiled algorithms report merge and map time.
+
+        >>> {'enabled': bool, 'execs': int, 'saturated': int,
+        >>>  'time': float, 'merge': float, 'map': float, 'clamp': float,
+        >>>  'units': {'NOOP': int, 'ADD': int, 'CSA': int},
+        >>>  'stages': [{'time', 'runs', 'NOOP', 'ADD', 'CSA'}, ...]}
+
+        saturated counts early exits, time is the sum of stage times.
+        """
+        profile = self._profile or _empty_profile()
+        stages  = [dict(stage) for stage in profile['stages']]
+        return {
+            'enabled'   : self._profile is not None,
+            'execs'     : profile['execs'],
+            'saturated' : profile['saturated'],
+            'time'      : sum(stage['time'] for stage in stages),
+            'merge'     : profile['merge'],
+            'map'       : profile['map'],
+            'clamp'     : profile['clamp'],
+            'units'     : {
+                unit: sum(stage[unit] for stage in stages) for unit in UNIT_TYPES.values()
+            },
+            'stages'    : stages,
+        }
+
+    def profile_merge(self, info: dict[str, Any]) -> None:
+        """
+        Add counters of profile_info(), for example from a worker process
+        running a copy of this algorithm, to this algorithm's profile.
+        """
+        if self._profile is None:
+            raise ValueError("Profiling is disabled, see Algorithm.profile()")
+        profile = self._profile
+        for key in ('execs', 'saturated', 'merge', 'map', 'clamp'):
+            profile[key] += info[key]
+        stages = profile['stages']
+        for s, stage in enumerate(info['stages']):
+            if len(stages) <= s:
+                stages.append({'time': 0.0, 'runs': 0, 'NOOP': 0, 'ADD': 0, 'CSA': 0})
+            for key, value in stage.items():
+                stages[s][key] += value
+        return None
+
+    def __exec_compiled(self, a: int, b: int) -> dict[int, mp.Matrix]:
+        """
+        Run compiled plan for a single set of inputs, see compile()
+        """
+        bits     = self.bits
+        boundary = (1 << bits) - 1
+        values   = [a << i if (b >> i) & 1 else 0 for i in range(bits)]
+        for src, dst, mask in self.plan['start']:
+            values[dst] = (values[dst] & ~mask) | (values[src] & mask)
+            values[src] &= ~mask
+
+        cache   = self.plan['cache']
+        profile = self._profile
+        stages  = [(self.plan['occupancy'], values)]
+        for s, (units, order, moves, occupancy) in enumerate(self.plan['stages']):
+            if profile is not None:
+                start = perf_counter()
+            if cache is None:
+                values = _compiled_stage(values, units, order, moves)
+            else:
+                # -- cached, outputs shared as tuples -------------------
+                entries = cache['stages'][s]
+                key     = tuple(values[y] for y in self.plan['touched'][s])
+                if (output := entries.get(key)) is not None:
+                    entries.move_to_end(key)
+                    cache['hits'][s] += 1
+                else:
+                    output = tuple(_compiled_stage(values, units, order, moves))
+                    entries[key] = output
+                    if cache['maxsize'] < len(entries):
+                        entries.popitem(last=False)
+                    cache['misses'][s] += 1
+                values = output
+
+            # -- saturate -------------------------------------------
+            if profile is not None:
+                _profile_stage(profile, s, (split := perf_counter()) - start, (u[0] for u in units))
+            exceeded = self.saturation and any(boundary < i for i in values)
+            if profile is not None:
+                profile['clamp']     += perf_counter() - split
+                profile['saturated'] += exceeded
+            if exceeded:
+                saturated    = [(1 << (bits << 1)) - 1] + [0] * (bits-1)
+                values       = [boundary] + [0] * (bits-1)
+                stages      += [(saturated, values)] * (len(self.plan['stages']) + 1 - len(stages))
+                break
+            stages.append((occupancy, values))
+
+        truth = {}
+        for i, (occupancy, values) in enumerate(stages):
+            if self.packed:
+                truth[i] = mp.Matrix.from_packed(list(occupancy), list(values))
+            else:
+                truth[i] = mp.Matrix(mp.unpack_rows(bits, occupancy, values))
+        self.matrix = truth[len(truth)-1]
+        self.state  = 0
+        return truth
 
     def auto_resolve_stage(self, *, recursive=True,
     ) -> None:
@@ -328,32 +622,44 @@ class Algorithm():
         Options:
             recursive: Recursively resolve until no partial products remain
         """
+        from multiplied.core.template import _resolve_rows
+
+        # Patterns only depend on the number of occupied rows, cached per
+        # stage by push(). Templates copy the rows they read, so pseudo
+        # matrices are shared rather than copied.
         stage = len(self.algorithm)
         # -- non recursive ------------------------------------------
         if not self.algorithm:
-            pseudo = deepcopy(self.matrix)
+            pseudo = self.matrix
+            rows   = self.bits - mp.empty_rows(pseudo)
         else:
-            pseudo = deepcopy(self.algorithm[stage-1]['pseudo'])
-        pattern = mp.resolve_pattern(pseudo)
+            pseudo = self.algorithm[stage-1]['pseudo']
+            rows   = self.__stage_rows(stage-1)
+        pattern = _resolve_rows(rows, self.bits)
         self.push(mp.Template(pattern, matrix=pseudo), dadda=self.dadda)
         if not recursive:
             return None
 
         # -- main loop ----------------------------------------------
         stage = len(self.algorithm)
-        while self.bits-1 > mp.empty_rows(self.algorithm[stage-1]['pseudo']):
-            if 10 < stage:
-                raise IndexError('Maximum stage limit reached')
+        while 1 < (rows := self.__stage_rows(stage-1)):
             # Stage generation
-            pseudo = deepcopy(self.algorithm[stage-1]['pseudo'])
-            new_pattern = mp.resolve_pattern(pseudo)
-            self.push(mp.Template(new_pattern, matrix=pseudo))
-
+            pseudo = self.algorithm[stage-1]['pseudo']
+            self.push(mp.Template(_resolve_rows(rows, self.bits), matrix=pseudo))
 
-            # Condition based on generated stage
+            # every stage removes at least one row, so this terminates
+            # for any bitwidth
+            if rows <= self.__stage_rows(stage):
+                raise ValueError(f"Stage {stage} does not reduce partial products")
             stage += 1
         return None
 
+    def __stage_rows(self, stage: int) -> int:
+        """Occupied rows of pseudo result of stage"""
+        if (rows := self._rows.get(stage)) is None:
+            rows = self._rows[stage] = self.bits - mp.empty_rows(self.algorithm[stage]['pseudo'])
+        return rows
+
     def step(self) -> mp.Matrix:
         """
         Execute the next stage of the algorithm and update internal matrix
@@ -370,29 +676,165 @@ class Algorithm():
         """
         Run entire algorithm with a single set of inputs then reset internal state.
         Returns list of results from all stages of the algorithm
+
+        Results are snapshots, not copies: every stage builds a new matrix
+        and maps rows copy-on-write, while saturated stages share a single
+        matrix. Treat results as read-only.
         """
         if not isinstance(a, int) or not isinstance(b, int):
             raise TypeError(f"Expected int, got {type(a)} and {type(b)}")
 
+        profile = self._profile
+        if profile is not None:
+            profile['execs'] += 1
         if a == 0 or b == 0:
-            return {0: mp.Matrix(self.bits)}
-        self.matrix = mp.Matrix(self.bits, a=a, b=b)
+            return {0: mp.Matrix(self.bits, packed=self.packed)}
+        if self.plan is not None:
+            return self.__exec_compiled(a, b)
+        self.matrix = mp.Matrix(self.bits, a=a, b=b, packed=self.packed)
         if self.dadda:
             hoist(self.matrix)
 
         truth = {0: self.matrix}
         self.state = 0
         for n in range(len(self.algorithm)):
-            self.__reduce()
-            if self.saturation and self.__clamp_bitwidth():
+            if profile is None:
+                self.__reduce()
+                saturated = self.saturation and self.__clamp_bitwidth()
+            else:
+                start = perf_counter()
+                self.__reduce()
+                _profile_stage(profile, n, perf_counter() - start, _template_heights(
+                    self.algorithm[n]['template'].bounds
+                ))
+                start     = perf_counter()
+                saturated = self.saturation and self.__clamp_bitwidth()
+                profile['clamp']     += perf_counter() - start
+                profile['saturated'] += saturated
+            if saturated:
                 for i in range(n, len(self.algorithm)):
-                    truth[i+1] = deepcopy(self.matrix)
+                    truth[i+1] = self.matrix
                 break
-            truth[n+1] = deepcopy(self.matrix)
+            truth[n+1] = self.matrix
 
         self.state = 0
         return truth
 
+    def exec_batch(self, a: Any, b: Any, *, packed: bool=False) -> dict[int, Any]:
+        """
+        Run entire algorithm for N pairs of operands at once using NumPy.
+        Compiles algorithm if required, see compile().
+
+        Returns dict of stage results, each a numpy.ndarray of either:
+
+        >>> (N, bits, 2*bits) uint8  -- one element per bit, '_' as 0
+        >>> (N, bits)         uint64 -- packed rows, see mp.Matrix
+
+        Pairs where either operand is zero are returned as zeroed matrices
+        for every stage.
+        """
+        import numpy as np
+
+        if 32 < self.bits:
+            raise ValueError(f"exec_batch supports up to 32-bits, got {self.bits}")
+        a = np.asarray(a)
+        b = np.asarray(b)
+        if a.ndim != 1 or a.shape != b.shape:
+            raise ValueError(f"Expected 1d operands of equal length, got {a.shape} and {b.shape}")
+        if not (np.issubdtype(a.dtype, np.integer) and np.issubdtype(b.dtype, np.integer)):
+            raise TypeError(f"Expected integer arrays, got {a.dtype} and {b.dtype}")
+        boundary = (1 << self.bits) - 1
+        if len(a) and (min(a.min(), b.min()) < 0 or boundary < max(a.max(), b.max())):
+            raise ValueError("Operand bit width exceeds matrix bit width")
+        if self.plan is None:
+            self.compile()
+
+        # -- build AND matrix ---------------------------------------
+        bits   = self.bits
+        a      = a.astype(np.uint64)
+        b      = b.astype(np.uint64)
+        values = np.zeros((len(a), bits), dtype=np.uint64)
+        for i in range(bits):
+            values[:, i] = np.where((b >> np.uint64(i)) & np.uint64(1), a << np.uint64(i), 0)
+        values = _batch_moves(values, self.plan['start'])
+
+        # -- reduce -------------------------------------------------
+        stages    = [values]
+        saturated = np.zeros(len(a), dtype=bool)
+        for units, order, moves, _ in self.plan['stages']:
+            output = np.zeros_like(values)
+            for height, y, sum_mask, carry_mask in units:
+                if height == 3: # CSA
+                    x0, x1, x2     = values[:, y], values[:, y+1], values[:, y+2]
+                    output[:, y]   = (x0 ^ x1 ^ x2) & np.uint64(sum_mask)
+                    carry          = (x0 & x1) | (x0 & x2) | (x1 & x2)
+                    output[:, y+1] = (carry << np.uint64(1)) & np.uint64(carry_mask)
+                elif height == 2: # ADD
+                    output[:, y]   = (values[:, y] + values[:, y+1]) & np.uint64(sum_mask)
+                else: # NOOP
+                    output[:, y]   = values[:, y] & np.uint64(sum_mask)
+
+            # -- map ------------------------------------------------
+            if order is not None:
+                output = output[:, order]
+            else:
+                output = _batch_moves(output, moves)
+            values = output
+
+            # -- saturate -------------------------------------------
+            if self.saturation:
+                saturated |= (np.uint64(boundary) < values).any(axis=1)
+                values[saturated]    = 0
+                values[saturated, 0] = boundary
+            stages.append(values)
+
+        if packed:
+            return dict(enumerate(stages))
+        shifts = np.arange((bits << 1)-1, -1, -1, dtype=np.uint64)
+        return {
+            i: ((stage[:, :, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+            for i, stage in enumerate(stages)
+        }
+
+    def detach(self) -> 'Algorithm':
+        """
+        Return a shallow copy sharing stages and compiled operations, with
+        its own profile counters and compiled stage cache, so executions of
+        the copy leave this algorithm untouched.
+
+        Profile and cache counters of the copy start from zero, so its
+        profile_info() can be passed to profile_merge() without counting
+        this algorithm's earlier executions twice. Cached outputs are kept.
+        """
+        from copy import copy
+
+        alg = copy(self)
+        alg._profile = None if self._profile is None else _empty_profile()
+        if self.plan is not None and self.plan['cache'] is not None:
+            cache    = self.plan['cache']
+            stages   = len(cache['stages'])
+            alg.plan = {**self.plan, 'cache': {
+                'maxsize' : cache['maxsize'],
+                'stages'  : [OrderedDict(entries) for entries in cache['stages']],
+                'hits'    : [0] * stages,
+                'misses'  : [0] * stages,
+            }}
+        return alg
+
+    def fingerprint(self) -> str:
+        """
+        Return 16 character hex digest identifying bitwidth, options and the
+        templates and maps of every stage. Independent of internal state.
+        """
+        from hashlib import sha256
+
+        digest = sha256(f"{self.bits}:{self.saturation}:{self.dadda}".encode())
+        for i, stage in self.algorithm.items():
+            digest.update(f"\n{i}\n".encode())
+            digest.update(mp.pretty(stage['template'].template).encode())
+            digest.update(mp.pretty(stage['map'].map).encode())
+        return digest.hexdigest()[:16]
+
     def reset(self, matrix: mp.Matrix) -> None:
         """
         Reset internal state and submit new initial matrix
@@ -430,6 +872,119 @@ class Algorithm():
 
 # -- helper functions -----------------------------------------------
 
+# -- profiling ------------------------------------------------------
+
+UNIT_TYPES = {1: 'NOOP', 2: 'ADD', 3: 'CSA'}
+
+def _empty_profile() -> dict[str, Any]:
+    """Zeroed profile counters, see Algorithm.profile()"""
+    return {'execs': 0, 'saturated': 0, 'merge': 0.0, 'map': 0.0, 'clamp': 0.0, 'stages': []}
+
+def _profile_stage(profile: dict[str, Any], s: int, elapsed: float, heights: Iterable[int]) -> None:
+    """Record one run of stage s, with units of given row heights"""
+    stages = profile['stages']
+    while len(stages) <= s:
+        stages.append({'time': 0.0, 'runs': 0, 'NOOP': 0, 'ADD': 0, 'CSA': 0})
+    stage = stages[s]
+    stage['time'] += elapsed
+    stage['runs'] += 1
+    for height in heights:
+        stage[UNIT_TYPES[height]] += 1
+
+def _template_heights(bounds: dict[str, list[tuple[int, int]]]) -> list[int]:
+    """Row heights of every arithmetic unit in template bounds"""
+    return [
+        coords[-1][1] - coords[0][1] + 1
+        for ch, coords in bounds.items() if ch != '_'
+    ]
+
+def _batch_moves(values: Any, moves: list[tuple[int, int, int]]) -> Any:
+    """Apply masked row moves, see mp.Map.moves(), to (N, bits) uint64 rows"""
+    import numpy as np
+    full = (1 << 64) - 1
+    for src, dst, mask in moves:
+        values[:, dst] = (values[:, dst] & np.uint64(~mask & full)) | (values[:, src] & np.uint64(mask))
+        values[:, src] &= np.uint64(~mask & full)
+    return values
+
+def unit_occupancy(rows: list[int], n: int) -> list[int]:
+    """
+    Return packed occupancy of the rows produced by an arithmetic unit, from
+    the occupancy of the 1 (NOOP), 2 (ADD) or 3 (CSA) rows it reduces.
+    Assumes each unit covers a contiguous run of columns.
+    """
+    match len(rows):
+        case 1: # NOOP
+            return [rows[0]]
+        case 2: # ADD
+            if not (union := rows[0] | rows[1]):
+                return [0, 0]
+            # output spans operands, plus a final carry unless
+            # operands already reach the leftmost column
+            top   = union.bit_length()
+            cout  = 0 if top == n else 1
+            width = union.bit_count()
+            return [((1 << (width+cout)) - 1) << (top-width), 0]
+        case 3: # CSA
+            occ_a, occ_b, occ_c = rows
+            if not (union := occ_a | occ_b | occ_c):
+                return [0, 0, 0]
+            # unit ends at the first empty column from the left
+            run   = (1 << union.bit_length()) - 1
+            holes = run & ~union
+            run  &= ~((1 << holes.bit_length()) - 1)
+            # carry generated where two or more bits present, any carry
+            # past the leftmost column is lost
+            pairs = ((occ_a & occ_b) | (occ_a & occ_c) | (occ_b & occ_c)) & run
+            return [run, (pairs << 1) & ((1 << n) - 1), 0]
+        case _:
+            raise ValueError(f"Unsupported unit type, len={len(rows)-1}")
+
+def _compiled_stage(values: list[int],
+    units: list[tuple[int, int, int, int]],
+    order: list[int] | None,
+    moves: list[tuple[int, int, int]] | None,
+) -> list[int]:
+    """Run a single compiled stage on packed row values, see compile()"""
+    output = [0] * len(values)
+    for height, y, sum_mask, carry_mask in units:
+        if height == 3: # CSA
+            x0, x1, x2  = values[y], values[y+1], values[y+2]
+            output[y]   = (x0 ^ x1 ^ x2) & sum_mask
+            output[y+1] = (((x0 & x1) | (x0 & x2) | (x1 & x2)) << 1) & carry_mask
+        elif height == 2: # ADD
+            output[y]   = (values[y] + values[y+1]) & sum_mask
+        else: # NOOP
+            output[y]   = values[y] & sum_mask
+
+    # -- map --------------------------------------------------------
+    if order is not None:
+        return [output[i] for i in order]
+    for src, dst, mask in moves:
+        output[dst] = (output[dst] & ~mask) | (output[src] & mask)
+        output[src] &= ~mask
+    return output
+
+def unit_values(rows: list[int], occupancy: list[int]) -> list[int]:
+    """
+    Return packed values of the rows produced by an arithmetic unit, masked
+    by their occupancy, see unit_occupancy().
+    """
+    match len(rows):
+        case 1: # NOOP
+            return [rows[0] & occupancy[0]]
+        case 2: # ADD
+            return [(rows[0] + rows[1]) & occupancy[0], 0]
+        case 3: # CSA
+            a, b, c = rows
+            return [
+                (a ^ b ^ c) & occupancy[0],
+                (((a & b) | (a & c) | (b & c)) << 1) & occupancy[1],
+                0,
+            ]
+        case _:
+            raise ValueError(f"Unsupported unit type, len={len(rows)-1}")
+
 # TODO: low priority
 def collect_arithmetic_units(
     source: mp.Matrix,
@@ -531,7 +1086,7 @@ def hoist(source: mp.Matrix | mp.Template, *,
 
     match source:
         case mp.Matrix():
-            matrix = source.matrix
+            matrix = source.matrix # unpacked copy if source.packed
         case mp.Template():
             matrix = source.template
         case _:
@@ -543,7 +1098,7 @@ def hoist(source: mp.Matrix | mp.Template, *,
 
 
     y_start = checksum.index(1)
-    y_end   = 8-checksum[::-1].index(1) if 1 in checksum else bits
+    y_end   = bits-checksum[::-1].index(1) if 1 in checksum else bits
     map_    = mp.empty_matrix(bits)
 
     for y in range(y_start, y_end):
@@ -570,4 +1125,6 @@ def hoist(source: mp.Matrix | mp.Template, *,
         for y in range(k):
             matrix[y][x] = column[y]
 
+    if isinstance(source, mp.Matrix) and source.packed:
+        source.matrix = matrix
     return mp.Map(map_)
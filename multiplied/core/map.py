@@ -51,6 +51,42 @@ class Map:
             map.append([rmap[i] for _ in range(n*2)])
         return map
 
+    def row_order(self) -> list[int]:
+        """
+        Return source row for each row after applying row map, such that
+        new_matrix[i] = matrix[order[i]]
+        """
+        order = list(range(self.bits))
+        for i in range(self.bits):
+            # convert signed hex to 2s complement if -ve
+            if ((val := int(self.rmap[i], 16)) & 128):
+                val = (~val + 1) & 255 # 2s complement
+            order[i-val], order[i] = order[i], order[i-val]
+        return order
+
+    def moves(self) -> list[tuple[int, int, int]]:
+        """
+        Group bit-wise map into masked row moves, applied in order:
+
+        >>> [(source_row, destination_row, mask), ...]
+
+        Bits sharing a row and offset move together. Mask bits follow packed
+        Matrix rows, the leftmost column being the most significant bit.
+        """
+        n     = self.bits << 1
+        moves = []
+        for y in range(self.bits):
+            offsets = {}
+            for x in range(n):
+                # convert signed hex to 2s complement if -ve
+                if ((val := int(self.map[y][x], 16)) & 128):
+                    val = (~val + 1) & 255 # 2s complement
+                if val != 0:
+                    offsets[val] = offsets.get(val, 0) | (1 << (n-1-x))
+            for val, mask in offsets.items():
+                moves.append((y, (y-val) % self.bits, mask))
+        return moves
+
     def __repr__(self) -> str:
         return f"<multiplied.{self.__class__.__name__} object at {hex(id(self))}>"
 
@@ -79,26 +115,18 @@ def build_dadda_map(bits: int) -> Map:
     """
     mp.validate_bitwidth(bits)
 
-    # TODO: Use hoist() to generate dadda maps
-    # -- Repulsive - Design algorithm for 16-bit+ ------------------------------ #
-    dadda_map = {                                                                #
-        4: [                                                                     #
-            ['00','00','00','00'] + ['00']*4,                                    #
-            ['00','00','00','FF'] + ['00']*4,                                    #
-            ['00','00','FE','FF'] + ['00']*4,                                    #
-            ['00','FD','FE','FF'] + ['00']*4                                     #
-        ],                                                                       #
-        8: [                                                                     #
-            ['00','00','00','00','00','00','00','00'] + ['00']*8,                #
-            ['00','00','00','00','00','00','00','FF'] + ['00']*8,                #
-            ['00','00','00','00','00','00','FE','FF'] + ['00']*8,                #
-            ['00','00','00','00','00','FD','FE','FF'] + ['00']*8,                #
-            ['00','00','00','00','FC','FD','FE','FF'] + ['00']*8,                #
-            ['00','00','00','FB','FC','FD','FE','FF'] + ['00']*8,                #
-            ['00','00','FA','FB','FC','FD','FE','FF'] + ['00']*8,                #
-            ['00','F9','FA','FB','FC','FD','FE','FF'] + ['00']*8                 #
-        ]                                                                        #
-    }                                                                            #
-    # -------------------------------------------------------------------------- #
-
-    return Map(dadda_map[bits])
+    # Row y holds y partial product bits right of column bits-y, each
+    # moved up to row 0 by its distance from column bits:
+    #
+    # >>> 00 00 00 00
+    # >>> 00 00 00 FF
+    # >>> 00 00 FE FF
+    # >>> 00 FD FE FF
+    dadda_map = [
+        [
+            f"{(x - bits) & 255:02X}" if bits - y <= x else '00'
+            for x in range(bits)
+        ] + ['00']*bits
+        for y in range(bits)
+    ]
+    return Map(dadda_map)
@@ -80,13 +80,27 @@ class Slice:
 class Matrix:
     """
     Partial Product Matrix
+
+    Cells are stored as nested lists of '_', '0' and '1' by default. With
+    packed=True each row is instead stored as two integers:
+
+    >>> ____1011 -> occupancy: 0b00001111, values: 0b00001011
+
+    The leftmost cell of a row is the most significant bit of both. A packed
+    matrix still exposes Matrix.matrix, though as an unpacked copy which is
+    rebuilt on every access.
     """
     def __init__(self, source: list[Any] | int, *,
         a: int=0,
         b: int=0,
+        packed: bool=False,
         # x_checksum=[], # Add handling if supplied
         # y_checksum=[], # Add handling if supplied
     ) -> None:
+        if not isinstance(packed, bool):
+            raise TypeError(f"Expected packed: bool, got {type(packed)}")
+        self.packed = packed
+
         # -- sanity check -------------------------------------------
         if isinstance(source, int):
             self.bits = source
@@ -99,7 +113,7 @@ class Matrix:
         else:
             raise TypeError(f"Expected integer or nested list, got {type(source)}")
 
-        self.matrix = source
+        self.matrix = source # packed by setter if self.packed
 
         # -- process custom matrix ----------------------------------
         # row_len  = self.bits << 1
@@ -127,10 +141,43 @@ class Matrix:
             # self.y_checksum = y_checksum
         return None
 
+    @classmethod
+    def from_packed(cls, occupancy: list[int], values: list[int]) -> "Matrix":
+        """
+        Build packed matrix directly from row occupancy masks and values.
+        Skips validation, rows are expected to be well formed.
+        """
+        matrix           = cls.__new__(cls)
+        matrix.bits      = len(occupancy)
+        matrix.packed    = True
+        matrix.occupancy = occupancy
+        matrix.values    = values
+        return matrix
+
+    @property
+    def matrix(self) -> list[list[str]]:
+        if self.packed:
+            return unpack_rows(self.bits, self.occupancy, self.values)
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, source: list[list[str]]) -> None:
+        if self.packed:
+            self.occupancy, self.values = pack_rows(source)
+            return None
+        self._matrix = source
+        return None
+
     def __zero_matrix(self, bits: int) -> None:
         """
         Build a wallace tree for a bitwidth of self.bits
         """
+        if self.packed:
+            row = (1 << bits) - 1
+            self.occupancy = [row << i for i in range(bits)]
+            self.values    = [0] * bits
+            return None
+
         row = ['0']*bits
         matrix = []
         for i in range(bits):
@@ -157,6 +204,14 @@ class Matrix:
 
 
         # -- generate -----------------------------------------------
+        if self.packed:
+            row = (1 << bits) - 1
+            self.occupancy = [row << i for i in range(bits)]
+            self.values    = [
+                operand_a << i if (operand_b >> i) & 1 else 0 for i in range(bits)
+            ]
+            return None
+
         # convert to binary, removing '0b' and padding with zeros
         a = bin(operand_a)[2:].zfill(bits)
         b = bin(operand_b)[2:].zfill(bits)
@@ -218,8 +273,13 @@ class Matrix:
         option = '0' if ignore_zeros else '_'
         offset = 0
         rmap   = []
+        matrix = self.matrix if not self.packed else []
         for i in range(self.bits):
-            if all([bit == '_' and bit != option for bit in self.matrix[i]]):
+            if self.packed:
+                empty = ignore_zeros and not self.occupancy[i]
+            else:
+                empty = all([bit == '_' and bit != option for bit in matrix[i]])
+            if empty:
                 offset += 1
                 val = 0
             else:
@@ -239,35 +299,62 @@ class Matrix:
                 f"Map bitwidth {map_.bits} does not match matrix bitwidth {self.bits}"
             )
 
-        # -- row-wise mapping ---------------------------------------
-
-        if rmap := map_.rmap:
-            # matrix = deepcopy(self.matrix) # TODO make this modify in-place
-            for i in range(self.bits):
-                # convert signed hex to 2s complement if -ve
-                if ((val := int(rmap[i], 16)) & 128):
-                    val = (~val + 1) & 255 # 2s complement
-                # matrix[i]     = ["_"] * (self.bits*2)
-                self.matrix[i-val], self.matrix[i] = self.matrix[i], self.matrix[i-val]
+        if self.packed:
+            self.__apply_packed_map(map_)
+            return None
 
-                # deprecate checksum in favor of coordinates
-                # self.y_checksum[i]     = 0
-                # self.y_checksum[i-val] = 1
-            # self.matrix = matrix
+        # Copy-on-write: rows are replaced, never modified, so earlier
+        # references to this matrix's rows are left untouched
 
+        # -- row-wise mapping ---------------------------------------
+        if map_.rmap:
+            self._matrix = [self._matrix[i] for i in map_.row_order()]
             return None
 
         # -- bit-wise mapping ---------------------------------------
         # TODO Update to use coordinates -- way too expensive currently
+        matrix = list(self._matrix)
+        copied = [False] * self.bits
         for y in range(self.bits):
             for x in range(self.bits << 1):
                 # convert signed hex to 2s complement if -ve
                 if ((val := int(map_.map[y][x], 16)) & 128):
                     val = (~val + 1) & 255 # 2s complement
                 if val != 0:
-                    self.matrix[y-val][x] = self.matrix[y][x]
-                    self.matrix[y][x] = '_'
+                    for row in (y, (y-val) % self.bits):
+                        if not copied[row]:
+                            matrix[row] = list(matrix[row])
+                            copied[row] = True
+                    matrix[y-val][x] = matrix[y][x]
+                    matrix[y][x] = '_'
+
+        self._matrix  = matrix
+        self.checksum = [0] * self.bits
+        return None
 
+    def __apply_packed_map(self, map_: mp.Map) -> None:
+        """
+        Packed equivalent of apply_map(). Bits sharing a row and offset are
+        moved together using a single mask.
+        """
+
+        # -- row-wise mapping ---------------------------------------
+        if map_.rmap:
+            order = map_.row_order()
+            self.occupancy = [self.occupancy[i] for i in order]
+            self.values    = [self.values[i] for i in order]
+            return None
+
+        # -- bit-wise mapping, copy-on-write -------------------------
+        occupancy, values = list(self.occupancy), list(self.values)
+        for src, dst, mask in map_.moves():
+            keep = ~mask
+            occupancy[dst] = (occupancy[dst] & keep) | (occupancy[src] & mask)
+            values[dst]    = (values[dst] & keep) | (values[src] & mask)
+            occupancy[src] &= keep
+            values[src]    &= keep
+
+        self.occupancy, self.values = occupancy, values
         self.checksum = [0] * self.bits
         return None
 
@@ -286,10 +373,11 @@ class Matrix:
             return False
         if matrix.bits != self.bits:
             return False
-        for i in range(self.bits):
-            if matrix.matrix[i] != self.matrix[i]:
-                return False
-        return True
+        if matrix.packed and self.packed:
+            return (
+                matrix.occupancy == self.occupancy and matrix.values == self.values
+            )
+        return matrix.matrix == self.matrix
 
     def __getitem__(self, index: int | slice) -> Slice:
         slice = self.matrix[index]
@@ -310,6 +398,8 @@ class Matrix:
 def empty_rows(matrix: Matrix) -> int:
     if not isinstance(matrix, Matrix):
         raise TypeError(f"Expected Matrix, got {type(matrix)}")
+    if matrix.packed:
+        return matrix.occupancy.count(0)
 
     empty_row = ['_' for i in range(matrix.bits*2)]
     return sum([matrix.matrix[i] == empty_row for i in range(matrix.bits)])
@@ -324,6 +414,40 @@ def empty_matrix(bits: int) -> list[list[str]]:
         matrix.append(["_"]*(bits*2))
     return matrix
 
+def pack_rows(matrix: list[list[str]]) -> tuple[list[int], list[int]]:
+    """
+    Convert nested list of '_', '0' and '1' into row occupancy masks and values
+
+    >>> pack_rows([['_', '_', '1', '0'], ['_', '0', '1', '_']])
+    ([3, 6], [2, 2])
+    """
+    occupancy   = [0] * len(matrix)
+    values      = [0] * len(matrix)
+    valid_chars = {'0', '_', '1'}
+    for i, row in enumerate(matrix):
+        if not valid_chars.issuperset(row):
+            raise ValueError(f"Expected {valid_chars}, got {row} in row {i}")
+        row          = "".join(row)
+        occupancy[i] = int(row.translate(_OCCUPANCY), 2)
+        values[i]    = int(row.translate(_VALUES), 2)
+    return occupancy, values
+
+def unpack_rows(bits: int, occupancy: list[int], values: list[int]
+) -> list[list[str]]:
+    """
+    Convert row occupancy masks and values into nested list of '_', '0' and '1'
+    """
+    n = bits << 1
+    matrix = []
+    for occ, val in zip(occupancy, values):
+        matrix.append([
+            ch if o == '1' else '_' for o, ch in zip(f"{occ:0{n}b}", f"{val:0{n}b}")
+        ])
+    return matrix
+
+_OCCUPANCY = str.maketrans({'_': '0', '0': '1', '1': '1'})
+_VALUES    = str.maketrans({'_': '0'})
+
 
 def matrix_merge(source: dict[str, Matrix],
     bounds: dict[str, list[tuple[int, int]]],
@@ -345,14 +469,19 @@ def matrix_merge(source: dict[str, Matrix],
 
 
     bits = list(source.values())[0].bits
+    if all(matrix.packed for matrix in source.values()):
+        return _packed_merge(source, bounds, bits)
+
     output = empty_matrix(bits)
     for unit, matrix in source.items():
         if bounds[unit] == '_':
             continue
+        rows = matrix.matrix
 
         # new bounding box covering whole result
         box_left = min(i[0] for i in bounds[unit])
         box_right = max(i[0] for i in bounds[unit])
+        cout_row = _carry_row(bounds[unit])
         i = 0
         while i < len(bounds[unit])-1:
 
@@ -361,11 +490,61 @@ def matrix_merge(source: dict[str, Matrix],
             if (y := left[1]) != right[1]:
                 raise ValueError(f"Missing bound pair for row {y}")
             for j in range(box_left, box_right+1):
-                output[y][j] = matrix.matrix[y][j]
-            if bounds[unit][-1][1] - bounds[unit][0][1] == 1:
-                if y ==  bounds[unit][0][1] and 0 <=box_left-1:
-                    cout = box_left-1
-                    output[y][cout] = matrix.matrix[y][cout]
+                output[y][j] = rows[y][j]
+            if y == cout_row and 0 <= box_left-1:
+                cout = box_left-1
+                output[y][cout] = rows[y][cout]
 
             i += 2
     return Matrix(output)
+
+def merge_masks(bounds: dict[str, list[tuple[int, int]]], bits: int
+) -> dict[str, dict[int, int]]:
+    """
+    Convert unit bounds into the packed row masks matrix_merge() copies:
+
+    >>> {unit: {row: mask, ...}, ...}
+    """
+    n     = bits << 1
+    masks = {}
+    for unit, points in bounds.items():
+        if unit == '_':
+            continue
+        box_left  = min(i[0] for i in points)
+        box_right = max(i[0] for i in points)
+        box       = ((1 << (box_right - box_left + 1)) - 1) << (n-1-box_right)
+        cout      = 1 << (n-box_left) if 0 <= box_left-1 else 0
+        carry_row = _carry_row(points)
+        masks[unit] = {}
+        i = 0
+        while i < len(points)-1:
+            left, right = points[i], points[i+1]
+            if (y := left[1]) != right[1]:
+                raise ValueError(f"Missing bound pair for row {y}")
+            masks[unit][y] = box | cout if y == carry_row else box
+            i += 2
+    return masks
+
+def _carry_row(points: list[tuple[int, int]]) -> int | None:
+    """
+    Row holding a unit's carry out, left of its bounding box. Adder: final
+    carry on sum row, CSA: leftmost carry on carry row, None otherwise.
+    """
+    height = points[-1][1] - points[0][1] + 1
+    return {2: points[0][1], 3: points[0][1]+1}.get(height)
+
+def _packed_merge(source: dict[str, Matrix],
+    bounds: dict[str, list[tuple[int, int]]],
+    bits: int,
+) -> Matrix:
+    """
+    Packed equivalent of matrix_merge(). Bounding boxes become row masks.
+    """
+    occupancy = [0] * bits
+    values    = [0] * bits
+    masks     = merge_masks(bounds, bits)
+    for unit, matrix in source.items():
+        for y, mask in masks[unit].items():
+            occupancy[y] = (occupancy[y] & ~mask) | (matrix.occupancy[y] & mask)
+            values[y]    = (values[y] & ~mask) | (matrix.values[y] & mask)
+    return Matrix.from_packed(occupancy, values)
@@ -0,0 +1,388 @@
+###################################
+# Operand Scopes For Truth Tables #
+###################################
+
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections.abc import Iterator
+from typing import Any
+
+
+# -- blocks ---------------------------------------------------------
+#
+# For each a in domain, valid b form one interval:
+#
+#   max(min_in, ceil(min_out / a)) <= b <= min(max_in, max_out // a)
+#
+# Both bounds are step functions of a, constant between divisor
+# boundaries of min_out - 1 and max_out. Consecutive a sharing the same
+# interval are stored as one block (a_lo, a_hi, b_lo, b_hi), so scope
+# size and offsets are found without visiting pairs.
+
+Block = tuple[int, int, int, int]
+
+class Scope(ABC):
+    """
+    Sized, shardable scope of operand pairs (a, b), covering positions
+    start..stop of its full sequence. Subclasses provide _slice() and
+    batches().
+    """
+
+    start: int
+    stop:  int
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def size(self) -> int:
+        """Number of pairs in scope, also for scopes too large for len()"""
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for a, b in self.batches():
+            yield from zip(a.tolist(), b.tolist())
+
+    def shard(self, i: int, n: int) -> 'Scope':
+        """
+        Return shard i of n, each holding self.size // n pairs or one more.
+        Shards are contiguous and together cover scope in order.
+        """
+        if not isinstance(n, int) or n < 1:
+            raise ValueError(f"Number of shards must be a positive integer, got {n}")
+        if not isinstance(i, int) or not 0 <= i < n:
+            raise ValueError(f"Shard index must be within 0..{n - 1}, got {i}")
+        size = self.size
+        return self._slice(
+            self.start + size * i // n,
+            self.start + size * (i + 1) // n,
+        )
+
+    def shards(self, n: int) -> list['Scope']:
+        """Return every shard of n, see Scope.shard()"""
+        return [self.shard(i, n) for i in range(n)]
+
+    @abstractmethod
+    def batches(self, batch_size: int = 16384) -> Iterator[tuple[Any, Any]]:
+        """Yield (a, b) numpy arrays of at most batch_size pairs each"""
+
+    @abstractmethod
+    def _slice(self, start: int, stop: int) -> 'Scope':
+        """Return scope of the same pairs covering positions start..stop"""
+
+    def _bounds(self, start: int, stop: int | None, total: int) -> None:
+        stop = total if stop is None else stop
+        if not isinstance(start, int) or not isinstance(stop, int):
+            raise TypeError("start and stop must be integers")
+        if not 0 <= start <= stop <= total:
+            raise ValueError(f"Expected 0 <= start <= stop <= {total}, got {start}, {stop}")
+        self.start = start
+        self.stop  = stop
+
+
+class TruthScope(Scope):
+    """
+    Operand pairs (a, b) from domain whose product ab lies within range,
+    both inclusive. Iterates in (a, b) order like mp.truth_scope().
+
+    >>> scope = TruthScope((1, 255), (1, 65535))
+    >>> len(scope)
+    65025
+    >>> for a, b in scope.shard(0, 4): ...
+    >>> for a, b in scope.batches(4096): ...   # numpy arrays
+    """
+
+    def __init__(self, domain_: tuple[int, int], range_: tuple[int, int], *,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> None:
+        if not all(isinstance(d, int) for d in domain_) or len(domain_) != 2:
+            raise TypeError("Domain must be a tuple of two integers.")
+        if not all(isinstance(r, int) for r in range_) or len(range_) != 2:
+            raise TypeError("Range must be a tuple of two integers.")
+        if domain_[0] <= 0 or range_[0] <= 0:
+            raise ValueError("Minimum input and output values must be greater than zero.")
+        if domain_[0] > domain_[1]:
+            raise ValueError("Minimum input value greater than maximum input value.")
+        if range_[0] > range_[1]:
+            raise ValueError("Minimum output greater than maximum output value.")
+
+        self.domain = tuple(domain_)
+        self.range  = tuple(range_)
+        self.blocks = _blocks(self.domain, self.range)
+
+        # pair offset of each block, offsets[-1] is size of whole scope
+        self.offsets = [0]
+        for a_lo, a_hi, b_lo, b_hi in self.blocks:
+            self.offsets.append(self.offsets[-1] + (a_hi - a_lo + 1) * (b_hi - b_lo + 1))
+
+        self._bounds(start, stop, self.offsets[-1])
+
+    def __repr__(self) -> str:
+        return f"TruthScope({self.domain}, {self.range}, start={self.start}, stop={self.stop})"
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        remaining = self.size
+        for i, offset, (a_lo, a_hi, b_lo, b_hi) in self._seek(self.start):
+            width = b_hi - b_lo + 1
+            a, b  = divmod(offset, width)
+            a += a_lo
+            b += b_lo
+            while remaining and a <= a_hi:
+                for y in range(b, min(b_hi + 1, b + remaining)):
+                    yield (a, y)
+                remaining -= min(b_hi + 1 - b, remaining)
+                a += 1
+                b  = b_lo
+            if not remaining:
+                return
+
+    def __getstate__(self) -> dict[str, Any]:
+        # blocks are cheap to rebuild, ship bounds only
+        return {'domain': self.domain, 'range': self.range, 'start': self.start, 'stop': self.stop}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state['domain'], state['range'], start=state['start'], stop=state['stop'])
+
+    def _slice(self, start: int, stop: int) -> 'TruthScope':
+        return TruthScope(self.domain, self.range, start=start, stop=stop)
+
+    def batches(self, batch_size: int = 16384) -> Iterator[tuple[Any, Any]]:
+        """
+        Yield (a, b) numpy arrays of at most batch_size pairs each. Arrays
+        are int64, or uint64 when operands exceed 63 bits.
+        """
+        import numpy as np
+
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+        dtype = np.uint64 if self.domain[1] >> 63 else np.int64
+
+        position = self.start
+        while position < self.stop:
+            end = min(position + batch_size, self.stop)
+            a_parts, b_parts = [], []
+            for i, offset, (a_lo, _, b_lo, b_hi) in self._seek(position):
+                # offsets may exceed numpy integers, rows are located in
+                # Python ints and only indices within the batch are arrays
+                count = min(self.offsets[i + 1], end) - (self.offsets[i] + offset)
+                width = b_hi - b_lo + 1
+                a, b  = divmod(offset, width)
+
+                # -- first, possibly partial, row ---------------------
+                head = min(count, width - b)
+                a_parts.append(np.full(head, a_lo + a, dtype=dtype))
+                b_parts.append(np.arange(head, dtype=dtype) + dtype(b_lo + b))
+
+                # -- whole rows, count - head < batch_size ------------
+                if head < count:
+                    index = np.arange(count - head, dtype=dtype)
+                    a_parts.append(index // dtype(width) + dtype(a_lo + a + 1))
+                    b_parts.append(index % dtype(width) + dtype(b_lo))
+                if self.offsets[i + 1] >= end:
+                    break
+            yield np.concatenate(a_parts), np.concatenate(b_parts)
+            position = end
+
+    def _seek(self, position: int) -> Iterator[tuple[int, int, Block]]:
+        """Yield (index, offset within block, block) from pair position onwards"""
+        i = bisect_right(self.offsets, position) - 1
+        offset = position - self.offsets[i]
+        for j in range(i, len(self.blocks)):
+            yield j, offset, self.blocks[j]
+            offset = 0
+
+
+# -- sampling -------------------------------------------------------
+#
+# Sample i depends on (seed, i) only, drawn from its own block of
+# SAMPLE_BLOCK samples, so shards and batches of any size reproduce
+# the same pairs. Stratified methods assign sample i to stratum
+# i % strata, giving every stratum an equal share.
+#
+#   uniform:   a, b uniform over 0..2**bits - 1
+#   magnitude: stratum s = bit_length(a) + bit_length(b), 2..2*bits,
+#              product within [2**(s-2), 2**s), uniform within stratum
+#   popcount:  stratum p = popcount(a) + popcount(b), 0..2*bits,
+#              uniform within stratum
+#   sobol:     2-D Sobol sequence, digitally shifted by seed
+
+SAMPLE_METHODS = ('uniform', 'magnitude', 'popcount', 'sobol')
+SAMPLE_BLOCK   = 4096
+
+class SampleScope(Scope):
+    """
+    Seeded sample of operand pairs (a, b) of bits wide operands, for
+    truth tables too large to enumerate.
+
+    >>> scope = SampleScope(32, 100_000, method='magnitude', seed=7)
+    >>> df = mp.truth_dataframe(scope, alg)
+    """
+
+    def __init__(self, bits: int, samples: int, *,
+        method: str = 'uniform',
+        seed: int = 0,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> None:
+        from multiplied.core.utils.bool import validate_bitwidth
+
+        validate_bitwidth(bits)
+        if not isinstance(samples, int) or samples < 0:
+            raise ValueError(f"samples must be a non-negative integer, got {samples}")
+        if method not in SAMPLE_METHODS:
+            raise ValueError(f"Unsupported sampling method {method!r}, expected one of {SAMPLE_METHODS}")
+        if not isinstance(seed, int) or seed < 0:
+            raise ValueError(f"seed must be a non-negative integer, got {seed}")
+
+        self.bits    = bits
+        self.samples = samples
+        self.method  = method
+        self.seed    = seed
+        self._bounds(start, stop, samples)
+
+    def __repr__(self) -> str:
+        return (f"SampleScope({self.bits}, {self.samples}, method={self.method!r}, "
+            f"seed={self.seed}, start={self.start}, stop={self.stop})")
+
+    def _slice(self, start: int, stop: int) -> 'SampleScope':
+        return SampleScope(self.bits, self.samples,
+            method=self.method, seed=self.seed, start=start, stop=stop
+        )
+
+    def batches(self, batch_size: int = 16384) -> Iterator[tuple[Any, Any]]:
+        """Yield (a, b) uint64 numpy arrays of at most batch_size pairs each"""
+        import numpy as np
+
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+
+        position = self.start
+        while position < self.stop:
+            end = min(position + batch_size, self.stop)
+            a_parts, b_parts = [], []
+            for block in range(position // SAMPLE_BLOCK, (end - 1) // SAMPLE_BLOCK + 1):
+                a, b = self._block(block)
+                lo = max(position, block * SAMPLE_BLOCK) - block * SAMPLE_BLOCK
+                hi = min(end, (block + 1) * SAMPLE_BLOCK) - block * SAMPLE_BLOCK
+                a_parts.append(a[lo:hi])
+                b_parts.append(b[lo:hi])
+            yield np.concatenate(a_parts), np.concatenate(b_parts)
+            position = end
+
+    def _block(self, block: int) -> tuple[Any, Any]:
+        """Return (a, b) of every sample in block"""
+        import numpy as np
+
+        index = np.arange(block * SAMPLE_BLOCK, (block + 1) * SAMPLE_BLOCK, dtype=np.uint64)
+        if self.method == 'sobol':
+            return _sobol(index, self.bits, self.seed)
+
+        rng  = np.random.default_rng([self.seed, block])
+        high = (1 << self.bits) - 1
+        n    = SAMPLE_BLOCK
+        if self.method == 'uniform':
+            a = rng.integers(0, high, size=n, dtype=np.uint64, endpoint=True)
+            b = rng.integers(0, high, size=n, dtype=np.uint64, endpoint=True)
+            return a, b
+
+        if self.method == 'magnitude':
+            s  = 2 + (index % np.uint64(2*self.bits - 1)).astype(np.int64)
+            lo = np.maximum(1, s - self.bits)
+            hi = np.minimum(self.bits, s - 1)
+            la = lo + (rng.random(n) * (hi - lo + 1)).astype(np.int64)
+            return _with_bit_length(rng, la), _with_bit_length(rng, s - la)
+
+        # popcount: split p between operands weighted by pairs available
+        p  = (index % np.uint64(2*self.bits + 1)).astype(np.int64)
+        pa = (_popcount_cdf(self.bits)[p] <= rng.random(n)[:, None]).sum(axis=1)
+        return _with_popcount(rng, pa, self.bits), _with_popcount(rng, p - pa, self.bits)
+
+
+def _blocks(domain_: tuple[int, int], range_: tuple[int, int]) -> list[Block]:
+    """Return non-empty blocks of scope, see layout above"""
+    min_in, max_in   = domain_
+    min_out, max_out = range_
+
+    blocks: list[Block] = []
+    a = min_in
+    while a <= max_in and a <= max_out:
+        # upper bound, clamped to max_in while max_out // a exceeds it
+        q_hi = max_out // a
+        if q_hi >= max_in:
+            b_hi, end_hi = max_in, max_out // max_in
+        else:
+            b_hi, end_hi = q_hi, max_out // q_hi
+        # lower bound ceil(min_out / a) = q_lo + 1, clamped to min_in
+        q_lo = (min_out - 1) // a
+        if q_lo < min_in:
+            b_lo, end_lo = min_in, max_in
+        else:
+            b_lo, end_lo = q_lo + 1, (min_out - 1) // q_lo
+        end = min(max_in, end_hi, end_lo)
+
+        if b_lo <= b_hi:
+            if blocks and blocks[-1][1] == a - 1 and blocks[-1][2:] == (b_lo, b_hi):
+                blocks[-1] = (blocks[-1][0], end, b_lo, b_hi)
+            else:
+                blocks.append((a, end, b_lo, b_hi))
+        a = end + 1
+    return blocks
+
+
+def _with_bit_length(rng: Any, length: Any) -> Any:
+    """Return uniform uint64 values of given bit lengths, each at least 1"""
+    import numpy as np
+
+    top  = np.left_shift(np.uint64(1), (length - 1).astype(np.uint64))
+    bits = rng.integers(0, (1 << 64) - 1, size=len(length), dtype=np.uint64, endpoint=True)
+    return top | (bits & (top - np.uint64(1)))
+
+def _with_popcount(rng: Any, count: Any, bits: int) -> Any:
+    """Return uniform uint64 values of bits width with given popcounts"""
+    import numpy as np
+
+    rank = rng.random((len(count), bits)).argsort(axis=1).argsort(axis=1)
+    set_ = (rank < count[:, None]).astype(np.uint64)
+    return np.bitwise_or.reduce(set_ << np.arange(bits, dtype=np.uint64), axis=1)
+
+def _popcount_cdf(bits: int) -> Any:
+    """
+    Return cdf[p][k], probability popcount(a) <= k given
+    popcount(a) + popcount(b) == p, uniform over such pairs.
+    """
+    import numpy as np
+    from math import comb
+
+    cdf = np.ones((2*bits + 1, bits + 1))
+    for p in range(2*bits + 1):
+        weights = [comb(bits, k) * comb(bits, p - k) if 0 <= p - k <= bits else 0
+            for k in range(bits + 1)]
+        total, acc = sum(weights), 0
+        for k, w in enumerate(weights):
+            acc += w
+            cdf[p][k] = acc / total
+    return cdf
+
+def _sobol(index: Any, bits: int, seed: int) -> tuple[Any, Any]:
+    """
+    Return points index of the 2-D Sobol sequence as bits wide integers,
+    XOR shifted by seed. Dimension one is van der Corput, dimension two
+    uses primitive polynomial x + 1.
+    """
+    import numpy as np
+
+    a = np.zeros(len(index), dtype=np.uint64)
+    b = np.zeros(len(index), dtype=np.uint64)
+    m = 1
+    for k in range(bits):
+        bit = ((index >> np.uint64(k)) & np.uint64(1)).astype(bool)
+        a[bit] ^= np.uint64(1 << (bits - 1 - k))
+        b[bit] ^= np.uint64(m << (bits - 1 - k))
+        m ^= m << 1
+    if seed:
+        high  = (1 << bits) - 1
+        shift = np.random.default_rng(seed).integers(0, high, size=2, dtype=np.uint64, endpoint=True)
+        a ^= shift[0]
+        b ^= shift[1]
+    return a, b
@@ -2,7 +2,7 @@
 # Returns Template Objects Using User Patterns #
 ################################################
 
-from copy import deepcopy
+from collections import OrderedDict
 from typing import Any
 from .utils.bool import isalpha, ischar
 import multiplied as mp
@@ -31,7 +31,7 @@ def build_csa(char: str, source_slice: mp.Slice
     n         = len(source_slice[0])
     tff       = mp.chartff(char) # Toggle flip flop
     result    = [['_']*n, ['_']*n, ['_']*n]
-    csa_slice = deepcopy(source_slice)
+    csa_slice = mp.Slice([row[:] for row in source_slice]) # ensure no references
 
     for i in range(n):
         # Generates slice of all possible bit placements, represented
@@ -68,7 +68,7 @@ def build_adder(char: str, source_slice: mp.Slice
     n           = len(source_slice[0])
     tff         = mp.chartff(char) # Toggle flip flop
     result      = [['_']*n, ['_']*n]
-    adder_slice = deepcopy(source_slice) # ensure no references
+    adder_slice = mp.Slice([row[:] for row in source_slice]) # ensure no references
 
     for i in range(n):
         # Generates slice of all possible bit placements, represented
@@ -108,11 +108,11 @@ def build_noop(char: str, source_slice: mp.Slice
 
     n          = len(source_slice[0])
     tff        = mp.chartff(char) # Toggle flip flop
-    noop_slice = deepcopy(source_slice) # ensure no references
+    noop_slice = mp.Slice([source_slice[0][:]]) # ensure no references
     for i in range(n):
         noop_slice[0][i] = next(tff) if (noop_slice[0][i] != '_') else '_'
 
-    return noop_slice, deepcopy(noop_slice) # avoids pointing to same object
+    return noop_slice, mp.Slice([noop_slice[0][:]]) # avoids pointing to same object
 
 def build_empty_slice(source_slice: mp.Slice) -> tuple[mp.Slice, mp.Slice]:
     """
@@ -128,11 +128,9 @@ def build_empty_slice(source_slice: mp.Slice) -> tuple[mp.Slice, mp.Slice]:
     if not isinstance(source_slice, mp.Slice):
         raise TypeError(f"Expected type mp.Slice, got {type(source_slice)}")
 
-    empty_slice = deepcopy(source_slice) # ensure no references
-    for row in range(len(source_slice)):
-        for i in range(empty_slice.bits):
-            empty_slice[row][i] = '_'
-    return empty_slice, deepcopy(empty_slice)
+    n           = source_slice.bits
+    empty_slice = mp.Slice([['_']*n + row[n:] for row in source_slice]) # ensure no references
+    return empty_slice, mp.Slice([row[:] for row in empty_slice])
 
 
 class Pattern:
@@ -234,7 +232,18 @@ class Template:
             self.checksum = [1 if ch != '_' else 0 for ch in source]
             if matrix is None:
                 matrix = mp.Matrix(self.bits)
+
+            # built once per (pattern, occupancy), see template_cache_info()
+            key = _template_key(source, matrix)
+            if (entry := _cache_get(key)) is not None:
+                self.template = [list(row) for row in entry[0]]
+                self.result   = [list(row) for row in entry[1]]
+                self.bounds   = {ch: list(b) for ch, b in entry[2].items()}
+                return None
             self.build_from_pattern(self.pattern, matrix)
+            self.bounds = self.find_bounding_box()
+            _cache_put(key, self)
+            return None
 
         # -- template handling ---------------------------------------
         elif (
@@ -355,41 +364,21 @@ class Template:
         rows   = self.bits
         items  = self.bits << 1
         bounds = {}
-        x, y   = 0, 0
-        while y < rows:
+        for y in range(rows):
+            row = [ch.upper() for ch in matrix[y]]
 
             # -- entry border -------------------------------------------
-            key = matrix[y][0].upper()
-            if key not in bounds:
-                bounds[key] = []
-            bounds[key].append((0, y))
+            bounds.setdefault(row[0], []).append((0, y))
 
             # -- central range ------------------------------------------
-            while x < items-1:
-                curr = matrix[y][x].upper()
-                next = matrix[y][x+1].upper()
-                if (curr == next) and isalpha(curr):
-                    x += 1
-                    continue
+            # only transitions between differing chars bound a unit
+            for x, (curr, next) in enumerate(zip(row, row[1:])):
                 if curr != next and (isalpha(curr) or isalpha(next)):
-                    if curr not in bounds:
-                        bounds[curr] = []
-                    bounds[curr].append((x, y))
-                    if next not in bounds:
-                        bounds[next] = []
-                    bounds[next].append((x+1, y))
-                    x += 1
-                    continue
-                x += 1
+                    bounds.setdefault(curr, []).append((x, y))
+                    bounds.setdefault(next, []).append((x+1, y))
 
             # -- exit border --------------------------------------------
-            key = matrix[y][x].upper()
-            if key not in bounds:
-                bounds[key] = []
-            bounds[key].append((x, y))
-
-            x  = 0
-            y += 1
+            bounds.setdefault(row[items-1], []).append((items-1, y))
 
         return bounds
 
@@ -481,17 +470,92 @@ class Template:
 
 
 
+# -- template cache -------------------------------------------------
+#
+# A pattern template depends only on the pattern and which matrix cells
+# are occupied. The exception is the right half of rows under '_', which
+# is kept by build_empty_slice(). Builds are therefore interned process
+# wide, least recently used first out. Entries hold rows as strings and
+# bounds as tuples, each Template gets its own mutable copy.
+
+_TEMPLATE_CACHE: OrderedDict = OrderedDict()
+_TEMPLATE_STATS = {'maxsize': 1024, 'hits': 0, 'misses': 0}
+_OCCUPIED       = bytes(48 if i == 95 else 49 for i in range(256)) # '_' -> '0' else '1'
+
+def template_cache_info() -> dict[str, int]:
+    """
+    Return hit, miss and size counters of the process wide pattern
+    template cache.
+
+    >>> {'hits': int, 'misses': int, 'maxsize': int, 'currsize': int}
+    """
+    return {**_TEMPLATE_STATS, 'currsize': len(_TEMPLATE_CACHE)}
+
+def template_cache_clear(*, maxsize: int | None = None) -> None:
+    """
+    Empty pattern template cache and reset its counters. Optionally
+    resize it, maxsize=0 disables caching.
+    """
+    if maxsize is not None:
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError(f"maxsize must be a non-negative integer, got {maxsize}")
+        _TEMPLATE_STATS['maxsize'] = maxsize
+    _TEMPLATE_CACHE.clear()
+    _TEMPLATE_STATS['hits'] = _TEMPLATE_STATS['misses'] = 0
+    return None
+
+def _template_key(pattern: Pattern, matrix: mp.Matrix) -> tuple:
+    """(pattern, row occupancy, blank rows) of a pattern template build"""
+    blank = [i for i, ch in enumerate(pattern) if ch == '_']
+    if matrix.packed:
+        return (
+            tuple(pattern.pattern), tuple(matrix.occupancy),
+            tuple(matrix.values[i] for i in blank),
+        )
+    rows      = ["".join(row) for row in matrix.matrix]
+    occupancy = tuple(
+        int(row.encode().translate(_OCCUPIED), 2) if row.isascii()
+        else int("".join('0' if ch == '_' else '1' for ch in row), 2)
+        for row in rows
+    )
+    return tuple(pattern.pattern), occupancy, tuple(rows[i][matrix.bits:] for i in blank)
+
+def _cache_get(key: tuple) -> tuple | None:
+    if (entry := _TEMPLATE_CACHE.get(key)) is None:
+        _TEMPLATE_STATS['misses'] += 1
+        return None
+    _TEMPLATE_CACHE.move_to_end(key)
+    _TEMPLATE_STATS['hits'] += 1
+    return entry
+
+def _cache_put(key: tuple, template: Template) -> None:
+    if not _TEMPLATE_STATS['maxsize']:
+        return None
+    _TEMPLATE_CACHE[key] = (
+        tuple("".join(row) for row in template.template),
+        tuple("".join(row) for row in template.result),
+        {ch: tuple(b) for ch, b in template.bounds.items()},
+    )
+    if _TEMPLATE_STATS['maxsize'] < len(_TEMPLATE_CACHE):
+        _TEMPLATE_CACHE.popitem(last=False)
+    return None
+
+
 def resolve_pattern(matrix: mp.Matrix) -> Pattern:
     """
     For a given matrix, progressively allocate CSAs then adders to pattern
     """
+    return _resolve_rows(matrix.bits - mp.empty_rows(matrix), matrix.bits)
+
+def _resolve_rows(rows: int, bits: int) -> Pattern:
+    """Pattern reducing the first rows of a bits wide matrix, see resolve_pattern()"""
     from multiplied.core.utils.char import chargen
     char  = chargen()
-    if (empty_rows := mp.empty_rows(matrix)) == matrix.bits:
-        return Pattern(['_'] * matrix.bits)
+    if (empty_rows := bits - rows) == bits:
+        return Pattern(['_'] * bits)
 
     # TODO use io.StringIO()
-    scope = matrix.bits - empty_rows
+    scope = rows
     new_pattern = []
     while 0 < scope:
         ch  = next(char)
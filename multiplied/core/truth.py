@@ -4,9 +4,19 @@
 
 
 from multiplied import Algorithm, Matrix
-import pandas as pd
-from multiprocessing import Pool
-from collections.abc import Generator
+from multiplied.core.scope import Scope, TruthScope
+import io
+from copy import copy
+from itertools import islice
+from functools import partial
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from typing import TYPE_CHECKING, Any
+
+# pandas and multiprocessing are imported on use, keeping Algorithm and
+# scopes importable without them
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 
@@ -26,6 +36,9 @@ def truth_scope(domain_: tuple[int,int], range_: tuple[int,int]
     Range: A tuple of integers representing the range of output values.
 
     Yields tuple: (operand_a, operand_b)
+
+    See mp.TruthScope for a sized, shardable scope and mp.SampleScope
+    for sampled scopes.
     """
 
     if not all([isinstance(d, int) for d in domain_]):
@@ -43,53 +56,8 @@ def truth_scope(domain_: tuple[int,int], range_: tuple[int,int]
         raise ValueError("Minimum input value greater than maximum input value.")
     if min_out > max_out:
         raise ValueError("Minimum output greater than maximum output value.")
-    if min_in > max_out:
-        raise ValueError("Minimum input value greater than maximum output value.")
-    if min_out > max_in:
-        raise ValueError("Minimum output value greater than maximum input value.")
-
-    x = min_in
-    while x <= max_in:
-        lower_bound = min_out//x if min_out//x > min_in else min_in
-        upper_bound = max_out//x if max_out//x < max_in else max_in
-        for y in range(lower_bound, upper_bound):
-            if min_out <= (k := x*y) <= max_out:
-                yield (x, y)
-            if max_out < k:
-                break
-        x += 1
-
-
-# def truth_scope_batch(domain_: tuple[int,int], range_: tuple[int,int], chunk_size: int
-# ) -> Generator[list[tuple]]:
-#     """Yields list of tuples from domain such that it's product (ab) lies within range
-
-#     Domain: A tuple of integers representing the domain of input values.
-#     Range: A tuple of integers representing the range of output values.
-
-#     Yields tuple: (operand_a, operand_b)
-#     """
-
-#     if not all([isinstance(d, int) for d in domain_]):
-#         raise TypeError("Domain must be a tuple of integers.")
-#     if not all([isinstance(r, int) for r in range_]):
-#         raise TypeError("Range must be a tuple of integers.")
-
-#     min_in, max_in = domain_
-#     min_out, max_out = range_
-
-#     # improve error messages
-#     if min_in <= 0 or min_out <= 0:
-#         raise ValueError("Minimum input and output values must be greater than zero.")
-#     if min_in > max_in:
-#         raise ValueError("Minimum input value greater than maximum input value.")
-#     if min_out > max_out:
-#         raise ValueError("Minimum output greater than maximum output value.")
-#     if min_in > max_out:
-#         raise ValueError("Minimum input value greater than maximum output value.")
-#     if min_out > max_in:
-#         raise ValueError("Minimum output value greater than maximum input value.")
-#     ...
+
+    yield from TruthScope(domain_, range_)
 
 
 def shallow_truth_table(scope: Generator[tuple], alg: Algorithm
@@ -100,14 +68,14 @@ def shallow_truth_table(scope: Generator[tuple], alg: Algorithm
 
     return (Matrix(alg.bits, a=a, b=b) for a, b in scope)
 
-def truth_table(scope: Generator, alg: Algorithm
+def truth_table(scope: Generator | Scope, alg: Algorithm
 ) -> Generator[dict]:
     """
     A generator which yields all stages of an algorithm for a given
     set of operands a, b.
     """
-    if not isinstance(scope, Generator):
-        raise TypeError("Scope must be a generator.")
+    if not isinstance(scope, Generator | Scope):
+        raise TypeError("Scope must be a generator or Scope instance.")
     if not isinstance(alg, Algorithm):
         raise TypeError(f"Expected Algorithm instance got {type(alg)}")
 
@@ -116,58 +84,222 @@ def truth_table(scope: Generator, alg: Algorithm
 
 
 
-def _dataframe_operand_worker(a: int, b: int) -> tuple:
-    return (a, b, a*b)
-
-def _dataframe_pretty_worker(a: int, b: int , alg: Algorithm) -> list:
-    pretty = []
-    for matrix in alg.exec(a=a, b=b).values():
-        pretty.append(str(matrix).split('\n')[:-1])
-    return pretty
-
-def _dataframe_entry_worker(a: int, b: int , alg: Algorithm) -> dict:
-    entry = {}
-    for stage, matrix in alg.exec(a=a, b=b).items():
-        for r, row in enumerate(matrix):
-            for b, bit in enumerate(row[::-1]):
-                entry[
-                    f"stage_{stage}_ppm_{r}_b_{b}"
-                ] = 0 if bit in ['_', '0'] else 1
-    return entry
-
-def truth_dataframe(scope: Generator[tuple[int, int]], alg: Algorithm
-) -> pd.DataFrame:
+def parallel_truth_table(scope: Generator | Scope, alg: Algorithm, *,
+    processes: int | None = None,
+    chunk_size: int = 1024,
+    ordered: bool = True,
+    prefetch: int | None = None,
+) -> Generator[tuple[tuple[int, int], dict[int, Matrix]]]:
     """
-    Return a pandas DataFrame of all stages of an algorithm for a given
-    set of operands a, b.
+    Parallel truth_table(). Yields ((a, b), stages) as chunks of scope are
+    evaluated across worker processes, streaming with bounded memory.
+
+    Options:
+        processes: Number of worker processes, defaults to every available core
+        chunk_size: Number of operand pairs evaluated per task
+        ordered: Yield in scope order, otherwise as chunks complete
+        prefetch: Maximum chunks in flight, defaults to twice the processes
     """
-    if not isinstance(scope, Generator):
-        raise TypeError("Scope must be a generator.")
+    if not isinstance(scope, Generator | Scope):
+        raise TypeError("Scope must be a generator or Scope instance.")
     if not isinstance(alg, Algorithm):
         raise TypeError(f"Expected Algorithm instance got {type(alg)}")
 
-    # -- old plan ---------------------------------------------------
-    # columns:: index | a | b | ppm_0 | ppm_1 | ... | ppm_s0 | ppm_s1 | ...
-    # ppm = partial product matrix, _<index> = row , _s<index> = formatted row
-    # df row = index | a | b | output | matrix[i]: int | ... | matrix[i]: str | ... |
+    from multiplied import unpack_rows
+
+    for chunk, rows in _parallel_chunks(scope, alg, _truth_table_chunk_worker,
+        processes=processes, chunk_size=chunk_size, ordered=ordered,
+        prefetch=prefetch, packed=True,
+    ):
+        for operands, stages in zip(chunk, rows):
+            if alg.packed:
+                truth = {i: Matrix.from_packed(o, v) for i, (o, v) in enumerate(stages)}
+            else:
+                truth = {i: Matrix(unpack_rows(alg.bits, o, v)) for i, (o, v) in enumerate(stages)}
+            yield operands, truth
+
+
+
+# -- worker pipeline ------------------------------------------------
+#
+# Algorithms are shipped once per process via the pool initializer, every
+# task is then a chunk of operand pairs evaluated in a single pass.
+
+_worker_alg: Algorithm | None = None
+
+def _init_worker(alg: Algorithm, packed: bool = False) -> None:
+    """Pool initializer: store algorithm once per worker process"""
+    global _worker_alg
+    if alg.plan is None:
+        alg.compile() # worker local copy
+    if packed:
+        alg.packed = True
+    if alg.profile_info()['enabled']:
+        alg.profile() # count this worker's executions only
+    _worker_alg = alg
+
+def _parallel_chunks(scope: Iterable[tuple[int, int]], alg: Algorithm,
+    worker: Callable[[list[tuple[int, int]]], Any], *,
+    processes: int | None,
+    chunk_size: int,
+    ordered: bool,
+    prefetch: int | None,
+    packed: bool = False,
+) -> Generator[tuple[list[tuple[int, int]], Any]]:
+    """
+    Yield (chunk, worker(chunk)) for chunks of scope evaluated across a
+    pool of processes. At most prefetch chunks are in flight, scope is
+    only consumed as results are taken. Unordered yields chunks as they
+    complete. Closing the generator terminates the pool.
+    """
+    import os
+    import queue
+    from multiprocessing import Pool
+
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive integer, got {chunk_size}")
+    if prefetch is not None and (not isinstance(prefetch, int) or prefetch < 1):
+        raise ValueError(f"prefetch must be a positive integer, got {prefetch}")
+
+    chunks = _chunks(scope, chunk_size)
+    done   = queue.Queue()
+    with Pool(processes, initializer=_init_worker, initargs=(alg, packed)) as pool:
+        limit   = prefetch or ((processes or os.cpu_count() or 1) << 1)
+        pending = deque()
+
+        def submit() -> bool:
+            if (chunk := next(chunks, None)) is None:
+                return False
+            if ordered:
+                pending.append((chunk, pool.apply_async(worker, (chunk,))))
+            else:
+                pending.append(chunk)
+                pool.apply_async(worker, (chunk,),
+                    callback=lambda r, c=chunk: done.put((c, r)),
+                    error_callback=lambda e, c=chunk: done.put((c, e)),
+                )
+            return True
+
+        while len(pending) < limit and submit():
+            pass
+        while pending:
+            if ordered:
+                chunk, result = pending.popleft()
+                result = result.get()
+            else:
+                chunk, result = done.get()
+                pending.remove(chunk)
+                if isinstance(result, BaseException):
+                    raise result
+            submit()
+            yield chunk, result
+        pool.close()
+        pool.join()
 
-    # -- new multi-index plan ---------------------------------------
-    #               | ppm_0              | ppm_1              |
-    # index | a | b | b0 | b1 | ... | bn | b0 | b1 | ... | bn | ... | ppm_s0 | ppm_s1 | ...
-    # 0     | 0 | 5 | 0  | 0  | ... | 0  | 0  | 0  | ... | 0  | ... |'000...'|'000...'| ...
+def _chunks(scope: Iterable[tuple[int, int]], chunk_size: int
+) -> Generator[list[tuple[int, int]]]:
+    """Yield lists of at most chunk_size operand pairs from scope"""
+    scope = iter(scope)
+    while chunk := list(islice(scope, chunk_size)):
+        yield chunk
 
+def _truth_columns(chunk: list[tuple[int, int]], alg: Algorithm, layout: str = 'bits'
+) -> tuple[Any, Any, list[list[str]]]:
+    """
+    Execute algorithm once per operand pair and return columnar results:
 
-    # -- duplicate generators for each pool -------------------------
-    from itertools import tee
-    scope1, scope2, scope3 = tee(scope, 3)
+    >>> operands : (N, 3) array         -- a | b | output, see _operand_dtype()
+    >>> bits     : (N, stages * bits * 2bits) int8 array
+    >>> pretty   : N lists of formatted stages
 
-    # Uses every available core
-    with Pool() as pool:
-        operands = pool.starmap(_dataframe_operand_worker, scope1)
-        pretty   = pool.starmap(_dataframe_pretty_worker, ((a, b, alg) for a, b in scope2))
-        data     = pool.starmap(_dataframe_entry_worker, ((a, b, alg) for a, b in scope3))
-        pool.close()
-        pool.join()
+    For the packed layout bits is instead a (N, stages * bits * 2) uint64
+    array of value, occupancy pairs per row and pretty is empty.
+
+    Multiply by zero only produces stage 0, it is repeated for all stages.
+    """
+    import numpy as np
+
+    if layout == 'packed':
+        return _packed_columns(chunk, alg)
+
+    stages   = len(alg) + 1
+    operands = np.empty((len(chunk), 3), dtype=_operand_dtype(alg.bits))
+    cells    = io.StringIO()
+    pretty   = []
+    for i, (a, b) in enumerate(chunk):
+        operands[i] = (a, b, a*b)
+        truth = alg.exec(a=a, b=b)
+        rows  = []
+        for stage in range(stages):
+            matrix = truth.get(stage, truth[len(truth)-1])
+            rows.append(["".join(row) for row in matrix.matrix])
+        pretty.append([str(r) for r in rows])
+        cells.write("".join("".join(r) for r in rows))
+
+    cells = np.frombuffer(cells.getvalue().encode(), dtype=np.uint8)
+    width = stages * alg.bits * (alg.bits << 1)
+    bits  = (cells == ord('1')).astype(np.int8).reshape(len(chunk), width)
+    return operands, bits, pretty
+
+def _packed_columns(chunk: list[tuple[int, int]], alg: Algorithm
+) -> tuple[Any, Any, list[list[str]]]:
+    """
+    Packed layout of _truth_columns(), read straight from the occupancy
+    and values of packed matrices without formatting cells.
+    """
+    import numpy as np
+
+    if not alg.packed:
+        alg = copy(alg) # shares stages and plan, only matrices are packed
+        alg.packed = True
+    stages   = len(alg) + 1
+    operands = np.empty((len(chunk), 3), dtype=_operand_dtype(alg.bits))
+    rows     = np.empty((len(chunk), stages * alg.bits * 2), dtype=np.uint64)
+    for i, (a, b) in enumerate(chunk):
+        operands[i] = (a, b, a*b)
+        truth = alg.exec(a=a, b=b)
+        row   = []
+        for stage in range(stages):
+            matrix = truth.get(stage, truth[len(truth)-1])
+            for value, occupancy in zip(matrix.values, matrix.occupancy):
+                row += (value, occupancy)
+        rows[i] = row
+    return operands, rows, []
+
+def _dataframe_chunk_worker(chunk: list[tuple[int, int]], layout: str = 'bits'
+) -> tuple[Any, Any, list[list[str]]]:
+    return _truth_columns(chunk, _worker_alg, layout)
+
+def _dataframe_profile_worker(chunk: list[tuple[int, int]], layout: str = 'bits'
+) -> tuple[tuple[Any, Any, list[list[str]]], dict[str, Any]]:
+    """_dataframe_chunk_worker() and profile counters of the chunk"""
+    result = _truth_columns(chunk, _worker_alg, layout)
+    info   = _worker_alg.profile_info()
+    _worker_alg.profile()
+    return result, info
+
+def _truth_table_chunk_worker(chunk: list[tuple[int, int]]
+) -> list[list[tuple[list[int], list[int]]]]:
+    """Packed (occupancy, values) rows of every stage, per operand pair"""
+    return [
+        [(m.occupancy, m.values) for m in _worker_alg.exec(a=a, b=b).values()]
+        for a, b in chunk
+    ]
+
+def _truth_frame(operands: Any, bits: Any, pretty: list[list[str]], alg: Algorithm,
+    layout: str = 'bits'
+) -> 'pd.DataFrame':
+    """Assemble columnar results into a truth table DataFrame"""
+    import pandas as pd
+
+    operand_columns = pd.DataFrame(operands, columns=['a', 'b', 'output'], dtype=_operand_dtype(alg.bits))
+    if layout == 'packed':
+        col = [
+            f"stage_{i}_ppm_{j}_{k}"
+            for i in range(len(alg) + 1) for j in range(alg.bits) for k in 'vo'
+        ]
+        table = pd.DataFrame(bits, columns=col, dtype='uint64')
+        return pd.concat([operand_columns, table], axis=1)
 
     col       = [''] * ((len(alg) + 1) * alg.bits * (alg.bits << 1))
     ppm_s_col = [''] * (len(alg) + 1)
@@ -179,9 +311,138 @@ def truth_dataframe(scope: Generator[tuple[int, int]], alg: Algorithm
                 n += 1
         ppm_s_col[i] = f"ppm_s_{i}"
 
-
-    operand_columns = pd.DataFrame(operands, columns=['a', 'b', 'output'], dtype='int32')
     pretty_columns  = pd.DataFrame(pretty, columns=ppm_s_col, dtype='str')
-    table           = pd.DataFrame(data, columns=col).astype('int8')
+    table           = pd.DataFrame(bits, columns=col, dtype='int8')
 
     return pd.concat([operand_columns, table, pretty_columns], axis=1)
+
+def _operand_dtype(bits: int) -> str:
+    """Narrowest dtype holding a, b and output of bits wide operands"""
+    if bits < 16:
+        return 'int32'
+    if bits < 32:
+        return 'int64'
+    return 'uint64' if bits == 32 else 'object'
+
+def validate_layout(layout: str, bits: int) -> None:
+    if layout not in ('bits', 'packed'):
+        raise ValueError(f"layout must be 'bits' or 'packed', got {layout!r}")
+    if layout == 'packed' and 32 < bits:
+        raise ValueError(f"packed layout supports up to 32-bits, got {bits}")
+
+def truth_layout(names: Iterable[str]) -> str:
+    """Return layout of truth table columns, 'packed' or 'bits'"""
+    for name in names:
+        field = str(name).split('_')
+        if len(field) == 5 and field[0] == 'stage' and field[4] in ('v', 'o'):
+            return 'packed'
+    return 'bits'
+
+def unpack_truth_frame(df: 'pd.DataFrame', *,
+    stages: list[int] | None = None,
+    ppm: list[int] | None = None,
+    bits: list[int] | None = None,
+    width: int | None = None,
+) -> 'pd.DataFrame':
+    """
+    Return packed layout truth table with value columns "stage_{s}_ppm_{p}_v"
+    unpacked into int8 columns "stage_{s}_ppm_{p}_b_{b}", as truth_dataframe()
+    with layout='bits'. Only selected stages, ppm rows and bits are unpacked,
+    None selects all. Other columns are kept, occupancy columns dropped.
+    Frames already in bits layout are returned unchanged.
+
+    Row width, 2 * bitwidth, is inferred from ppm columns unless given.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if truth_layout(df.columns) == 'bits':
+        return df
+
+    fields = {
+        name: str(name).split('_') for name in df.columns
+        if truth_layout([name]) == 'packed'
+    }
+    if width is None:
+        width = (max(int(f[3]) for f in fields.values()) + 1) << 1
+    shifts = [
+        k for k in range(width-1, -1, -1)
+        if bits is None or k in bits
+    ]
+    packed = [
+        name for name, f in fields.items()
+        if f[4] == 'v'
+        and (stages is None or int(f[1]) in stages)
+        and (ppm is None or int(f[3]) in ppm)
+    ]
+
+    values = df[packed].to_numpy(dtype=np.uint64)
+    cells  = (values[:, :, None] >> np.array(shifts, dtype=np.uint64)) & np.uint64(1)
+    col    = [f"{name[:-2]}_b_{k}" for name in packed for k in shifts]
+    table  = pd.DataFrame(
+        cells.astype(np.int8).reshape(len(df), len(col)), columns=col, index=df.index
+    )
+    other = [name for name in df.columns if name not in fields]
+    return pd.concat([df[other], table], axis=1)
+
+def truth_dataframe(scope: Generator[tuple[int, int]] | Scope, alg: Algorithm, *,
+    processes: int | None = None,
+    chunk_size: int = 1024,
+    layout: str = 'bits',
+) -> 'pd.DataFrame':
+    """
+    Return a pandas DataFrame of all stages of an algorithm for a given
+    set of operands a, b.
+
+    Options:
+        processes: Number of worker processes, defaults to every available core
+        chunk_size: Number of operand pairs evaluated per task
+        layout: 'bits' for one int8 column per bit and formatted strings,
+            'packed' for uint64 value "_v" and occupancy "_o" columns per
+            row, see unpack_truth_frame()
+    """
+    if not isinstance(scope, Generator | Scope):
+        raise TypeError("Scope must be a generator or Scope instance.")
+    if not isinstance(alg, Algorithm):
+        raise TypeError(f"Expected Algorithm instance got {type(alg)}")
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive integer, got {chunk_size}")
+    validate_layout(layout, alg.bits)
+
+    # -- old plan ---------------------------------------------------
+    # columns:: index | a | b | ppm_0 | ppm_1 | ... | ppm_s0 | ppm_s1 | ...
+    # ppm = partial product matrix, _<index> = row , _s<index> = formatted row
+    # df row = index | a | b | output | matrix[i]: int | ... | matrix[i]: str | ... |
+
+    # -- new multi-index plan ---------------------------------------
+    #               | ppm_0              | ppm_1              |
+    # index | a | b | b0 | b1 | ... | bn | b0 | b1 | ... | bn | ... | ppm_s0 | ppm_s1 | ...
+    # 0     | 0 | 5 | 0  | 0  | ... | 0  | 0  | 0  | ... | 0  | ... |'000...'|'000...'| ...
+
+    import numpy as np
+    from multiprocessing import Pool
+
+    # -- profiled algorithms collect worker counters per chunk -------
+    profiled = alg.profile_info()['enabled']
+    with Pool(processes, initializer=_init_worker, initargs=(alg,)) as pool:
+        worker  = partial(
+            _dataframe_profile_worker if profiled else _dataframe_chunk_worker, layout=layout
+        )
+        results = pool.imap(worker, _chunks(scope, chunk_size))
+        operands, bits, pretty = [], [], []
+        for result in results:
+            if profiled:
+                result, info = result
+                alg.profile_merge(info)
+            chunk_operands, chunk_bits, chunk_pretty = result
+            operands.append(chunk_operands)
+            bits.append(chunk_bits)
+            pretty += chunk_pretty
+        pool.close()
+        pool.join()
+
+    if not operands: # empty scope
+        return _truth_frame(*_truth_columns([], alg, layout), alg, layout)
+    return _truth_frame(
+        np.concatenate(operands), np.concatenate(bits), pretty, alg, layout
+    )
@@ -5,10 +5,13 @@
 from typing import Any
 
 
-SUPPORTED_BITWIDTHS = {4, 8}
+# Upper bound set by unit labels: chargen() cycles 26 letters and a
+# 64-bit Wallace stage needs 22 CSAs. Map offsets, signed 8-bit hex,
+# would allow up to 128 rows.
+SUPPORTED_BITWIDTHS = range(2, 65)
 
 
-def validate_bitwidth(bits: int) -> None | ValueError:
+def validate_bitwidth(bits: int) -> None:
     """Raise ValueError if bitwidth is unsupported
 
     Parameters
@@ -16,12 +19,13 @@ def validate_bitwidth(bits: int) -> None | ValueError:
         bits : Bitwidth to validate
 
     Returns:
-        None if bitwidth is supported, ValueError otherwise
+        None if bitwidth is supported, raises ValueError otherwise
     """
     if not isinstance(bits, int) or bits not in SUPPORTED_BITWIDTHS:
-       return ValueError(
-            f"Unsupported bitwidth {bits}. Expected {SUPPORTED_BITWIDTHS}"
-       )
+        raise ValueError(
+            f"Unsupported bitwidth {bits}. Expected "
+            f"{SUPPORTED_BITWIDTHS.start} to {SUPPORTED_BITWIDTHS.stop - 1}"
+        )
 
 def isint(source: Any) -> bool:
     """Return True if source converts to int"""
@@ -1,15 +1,284 @@
 from collections.abc import Generator
+from functools import partial
+from typing import Any
+from multiplied import Algorithm, Scope
 import pyarrow as pa
 import pandas as pd
 
 
 """
-Exporting to parquet is pretty simple: .to_parquet
-After playing with pandas check if it's worth implementing these
+Truth tables are streamed to .parquet in fixed-size batches, each batch
+appended as a row group. Peak memory depends on batch size only, not the
+size of the truth table.
+
+Exported files carry key/value metadata in their footer, see
+import_metadata(), prefixed with "multiplied.":
+
+>>> bits, stages, rows, fingerprint, saturation, dadda, domain, range, layout
 """
 
-def export_parquet(source:  pd.DataFrame, path: str, batch_size: int) -> None:
-    raise NotImplementedError
+METADATA_PREFIX = 'multiplied.'
+
+def validate_path(path: str) -> None:
+    if not isinstance(path, str):
+        raise TypeError("path must be a string")
+    if not path.endswith('.parquet'):
+        raise ValueError("path must end with .parquet")
+
+def export_parquet(scope: Generator[tuple[int, int]] | Scope, alg: Algorithm, path: str, *,
+    batch_size: int = 16384,
+    layout: str = 'bits',
+    processes: int | None = 1,
+    prefetch: int | None = None,
+) -> None:
+    """
+    Evaluate truth table for scope in batches, appending each batch to .parquet
+    as a row group. Columns match mp.truth_dataframe().
+
+    Options:
+        batch_size: Number of operand pairs evaluated, and rows written, per batch
+        layout: Column layout 'bits' or 'packed', see mp.truth_dataframe()
+        processes: Worker processes evaluating batches, None for every core,
+            1 evaluates in this process
+        prefetch: Maximum batches in flight across workers, bounding memory
+    """
+    from multiplied.core.truth import _chunks, _parallel_chunks, _dataframe_chunk_worker
+
+    validate_path(path)
+    if not isinstance(scope, Generator | Scope):
+        raise TypeError("Scope must be a generator or Scope instance.")
+    if not isinstance(alg, Algorithm):
+        raise TypeError(f"Expected Algorithm instance got {type(alg)}")
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+
+    # compile a detached copy, leaving source algorithm untouched
+    alg = alg.detach()
+    if alg.plan is None:
+        alg.compile()
+
+    writer = TruthWriter(path, alg, layout=layout)
+    try:
+        if processes == 1:
+            for chunk in _chunks(scope, batch_size):
+                writer.write(chunk)
+            return None
+
+        # -- parallel: workers evaluate, batches written in order ---
+        worker = partial(_dataframe_chunk_worker, layout=layout)
+        for chunk, columns in _parallel_chunks(scope, alg, worker,
+            processes=processes, chunk_size=batch_size, ordered=True, prefetch=prefetch,
+        ):
+            writer.write_columns(*columns)
+    finally:
+        writer.close()
+    return None
+
+class TruthWriter():
+    """
+    Append truth table batches of a compiled algorithm to a single .parquet
+    file, one row group per batch. Metadata is written on close, empty
+    files are given a valid schema.
+
+    >>> writer = TruthWriter(path, alg)
+    >>> writer.write([(a, b), ...])
+    >>> writer.close()
+    """
+
+    def __init__(self, path: str, alg: Algorithm, *,
+        layout: str = 'bits',
+        metadata: dict[str, Any] | None = None
+    ) -> None:
+        from multiplied.core.truth import validate_layout
+
+        validate_path(path)
+        validate_layout(layout, alg.bits)
+        if alg.plan is None:
+            raise ValueError("Algorithm must be compiled, see Algorithm.compile()")
+        self.path     = path
+        self.alg      = alg
+        self.layout   = layout
+        self.metadata = {} if metadata is None else metadata
+        self.schema   = None
+        self.writer   = None
+        self.rows     = 0
+        self.domain: list[int | None] = [None, None]
+        self.range_: list[int | None] = [None, None]
+
+    def write(self, chunk: list[tuple[int, int]]) -> None:
+        """Evaluate operand pairs and append them as a row group"""
+        from multiplied.core.truth import _truth_columns
+
+        self.write_columns(*_truth_columns(chunk, self.alg, self.layout))
+
+    def write_columns(self, operands: Any, bits: Any, pretty: list[list[str]]) -> None:
+        """Append columnar results of evaluated operand pairs as a row group"""
+        import pyarrow.parquet as pq
+        from multiplied.core.truth import _truth_frame
+
+        batch = _truth_frame(operands, bits, pretty, self.alg, self.layout)
+        table = pa.Table.from_pandas(batch, schema=self.schema, preserve_index=False)
+        if self.writer is None:
+            self.schema = table.schema
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(table)
+        if not len(operands):
+            return None
+
+        # -- observed operand domain and output range ---------------
+        self.rows  += len(operands)
+        self.domain = _extend_interval(self.domain, operands[:, :2])
+        self.range_ = _extend_interval(self.range_, operands[:, 2])
+
+    def close(self) -> None:
+        """Write metadata and close file, writing an empty table if unused"""
+        if self.writer is None:
+            self.write([])
+        self.writer.add_key_value_metadata(truth_metadata(self.alg,
+            rows=self.rows, domain=self.domain, range_=self.range_,
+            layout=self.layout, **self.metadata
+        ))
+        self.writer.close()
+
+def _extend_interval(interval: list[int | None], values) -> list[int | None]:
+    lo, hi = int(values.min()), int(values.max())
+    if interval[0] is None:
+        return [lo, hi]
+    return [min(lo, interval[0]), max(hi, interval[1])]
+
+def truth_metadata(alg: Algorithm, *,
+    rows: int,
+    domain: list[int | None],
+    range_: list[int | None],
+    **extra: Any,
+) -> dict[str, str]:
+    """
+    Return parquet key/value metadata describing a truth table of alg.
+    Values, including any extra keys, are JSON encoded.
+    """
+    import json
+
+    metadata = {
+        'bits'        : alg.bits,
+        'stages'      : len(alg) + 1,
+        'rows'        : rows,
+        'fingerprint' : alg.fingerprint(),
+        'saturation'  : alg.saturation,
+        'dadda'       : alg.dadda,
+        'domain'      : domain,
+        'range'       : range_,
+        **extra,
+    }
+    return {METADATA_PREFIX + k: json.dumps(v) for k, v in metadata.items()}
+
+def import_metadata(path: str) -> dict[str, Any]:
+    """
+    Return multiplied metadata of .parquet truth table, reading only the
+    file footer. Empty if the file was not written by export_parquet().
+
+    >>> import_metadata('8b_wallace.parquet')
+    {'bits': 8, 'stages': 5, 'rows': 65025, 'fingerprint': '3f1c...', ...}
+    """
+    import json
+    import pyarrow.parquet as pq
+
+    validate_path(path)
+    metadata = pq.read_metadata(path).metadata or {}
+    prefix   = METADATA_PREFIX.encode()
+    return {
+        k[len(prefix):].decode(): json.loads(v)
+        for k, v in metadata.items() if k.startswith(prefix)
+    }
+
+def import_parquet(path: str, batch_size: int = 16384, *,
+    stages: list[int] | None = None,
+    ppm: list[int] | None = None,
+    bits: list[int] | None = None,
+    columns: list[str] | None = None,
+    arrow: bool = False,
+) -> Generator[pd.DataFrame | pa.RecordBatch]:
+    """
+    Yield truth table from .parquet in batches of at most batch_size rows.
+
+    Options:
+        stages, ppm, bits: Only read bit columns "stage_{s}_ppm_{p}_b_{b}"
+            matching every given selection, None selects all.
+        columns: Additional columns to read, e.g. ['a', 'b', 'output'].
+            All columns are read if no selection or columns are given.
+        arrow: Yield pyarrow.RecordBatch instead of pandas DataFrame
+    """
+    import pyarrow.parquet as pq
+
+    validate_path(path)
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+
+    pf = pq.ParquetFile(path)
+    projection = select_columns(pf.schema_arrow.names,
+        stages=stages, ppm=ppm, bits=bits, columns=columns
+    )
+    for batch in pf.iter_batches(batch_size=batch_size, columns=projection):
+        yield batch if arrow else batch.to_pandas()
+
+def select_columns(names: list[str], *,
+    stages: list[int] | None = None,
+    ppm: list[int] | None = None,
+    bits: list[int] | None = None,
+    columns: list[str] | None = None,
+) -> list[str] | None:
+    """
+    Return names of columns matching selection, in file order, or None if
+    nothing is selected. Bit columns are named "stage_{s}_ppm_{p}_b_{b}".
+
+    Packed layout columns "stage_{s}_ppm_{p}_v" and "stage_{s}_ppm_{p}_o"
+    hold every bit of a row and are selected by stages and ppm only.
+    """
+    if stages is None and ppm is None and bits is None:
+        return None if columns is None else list(columns)
+
+    selection = [] if columns is None else list(columns)
+    for name in names:
+        field = name.split('_')
+        if field[0] != 'stage' or len(field) not in (5, 6):
+            continue
+        s, p = int(field[1]), int(field[3])
+        b    = int(field[5]) if len(field) == 6 else None
+        if (
+            (stages is None or s in stages) and
+            (ppm is None or p in ppm) and
+            (bits is None or b is None or b in bits)
+        ):
+            selection.append(name)
+    return selection
+
+def operand_filter(*,
+    a: int | tuple[int, int] | None = None,
+    b: int | tuple[int, int] | None = None,
+    output: int | tuple[int, int] | None = None,
+) -> Any:
+    """
+    Return pyarrow expression selecting rows whose a, b and output equal a
+    given int or lie within inclusive (lo, hi) bounds, None if unbounded.
+    """
+    import pyarrow.compute as pc
+
+    expression = None
+    for name, interval in (('a', a), ('b', b), ('output', output)):
+        if interval is None:
+            continue
+        lo, hi = _interval(interval, name)
+        bounds = (pc.field(name) >= lo) & (pc.field(name) <= hi)
+        expression = bounds if expression is None else expression & bounds
+    return expression
 
-def import_parquet(path: str, batch_size: int) -> Generator[pd.DataFrame]:
-    raise NotImplementedError
+def _interval(interval: int | tuple[int, int], name: str) -> tuple[int, int]:
+    if isinstance(interval, int):
+        return interval, interval
+    if (
+        isinstance(interval, tuple) and len(interval) == 2
+        and all(isinstance(i, int) for i in interval)
+    ):
+        if interval[1] < interval[0]:
+            raise ValueError(f"{name} bounds must satisfy lo <= hi, got {interval}")
+        return interval
+    raise TypeError(f"{name} must be an int or tuple of two ints, got {interval}")
@@ -249,8 +249,191 @@ def test_exec_dadda_saturation() -> None:
     print(a*b, '<- unsaturated')
 
 
+def test_exec_packed() -> None:
+    for saturation, dadda in [(False, False), (True, False), (False, True), (True, True)]:
+        alg    = mp.Algorithm(8, saturation=saturation, dadda=dadda)
+        packed = mp.Algorithm(8, saturation=saturation, dadda=dadda, packed=True)
+        alg.auto_resolve_stage()
+        packed.auto_resolve_stage()
+        for a, b in [(1, 1), (2, 255), (27, 255), (69, 255), (255, 255)]:
+            expected = alg.exec(a, b)
+            output   = packed.exec(a, b)
+            assert all(m.packed for m in output.values())
+            assert output == expected
+        assert packed.matrix.values[0] == (a*b if not saturation else 255)
+
+def test_exec_compiled() -> None:
+    for saturation, dadda in [(False, False), (True, False), (False, True), (True, True)]:
+        alg = mp.Algorithm(8, saturation=saturation, dadda=dadda)
+        alg.auto_resolve_stage()
+        expected = {(a, b): alg.exec(a, b) for a in (1, 2, 27, 255) for b in (1, 170, 255)}
+        alg.compile()
+        for (a, b), truth in expected.items():
+            assert alg.exec(a, b) == truth
+        alg.push(mp.Pattern(['_']*8))
+        assert alg.plan is None
+
+def test_exec_batch() -> None:
+    import numpy as np
+    alg = mp.Algorithm(4, saturation=True)
+    alg.auto_resolve_stage()
+    a, b   = np.meshgrid(np.arange(1, 16), np.arange(1, 16))
+    a, b   = a.ravel(), b.ravel()
+    stages = alg.exec_batch(a, b)
+    rows   = alg.exec_batch(a, b, packed=True)
+    assert stages[0].shape == (len(a), 4, 8) and stages[0].dtype == np.uint8
+    assert rows[0].shape == (len(a), 4) and rows[0].dtype == np.uint64
+    for i in range(len(a)):
+        for s, m in alg.exec(int(a[i]), int(b[i])).items():
+            assert stages[s][i].tolist() == [[int(ch == '1') for ch in row] for row in m]
+            assert rows[s][i].tolist() == mp.to_int_matrix(m.matrix)
+
+def test_exec_snapshots() -> None:
+    for saturation, dadda in [(False, False), (True, False), (False, True), (True, True)]:
+        alg = mp.Algorithm(8, saturation=saturation, dadda=dadda)
+        alg.auto_resolve_stage()
+        held     = alg.exec(27, 255)
+        expected = {s: str(m) for s, m in held.items()}
+        alg.exec(255, 255)
+        alg.exec(2, 3)
+        assert {s: str(m) for s, m in held.items()} == expected
+
+def test_exec_cache() -> None:
+    alg = mp.Algorithm(4, saturation=True)
+    alg.auto_resolve_stage()
+    alg.compile()
+    expected = {(a, b): alg.exec(a, b) for a in range(1, 16) for b in range(1, 16)}
+    assert alg.cache_info()['maxsize'] == 0
+
+    alg.compile(cache=8)
+    for _ in range(2):
+        for (a, b), truth in expected.items():
+            assert alg.exec(a, b) == truth
+    info = alg.cache_info()
+    assert info['maxsize'] == 8 and 0 < info['hits']
+    assert info['hits'] + info['misses'] == sum(hits + misses for hits, misses, _ in info['stages'])
+    assert all(size <= 8 for _, _, size in info['stages'])
+
+    alg.push(mp.Pattern(['_']*4))
+    assert alg.cache_info()['currsize'] == 0
+
+def test_detach() -> None:
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    alg.compile(cache=8)
+    alg.profile()
+    alg.exec(3, 5)
+    before = (alg.profile_info(), alg.cache_info())
+
+    other = alg.detach()
+    assert other.plan['stages'] is alg.plan['stages'] and other.algorithm is alg.algorithm
+    assert other.profile_info()['execs'] == 0
+    assert other.cache_info()['currsize'] == before[1]['currsize']
+    for a in range(1, 16):
+        other.exec(a, 7)
+    assert (alg.profile_info(), alg.cache_info()) == before
+    assert other.profile_info()['execs'] == 15
+    assert other.cache_info()['hits'] + other.cache_info()['misses'] > 0
+
+    # merging the copy back counts every execution once
+    alg.profile_merge(other.profile_info())
+    assert alg.profile_info()['execs'] == before[0]['execs'] + 15
+    before = (alg.profile_info(), alg.cache_info())
+
+    # exports run on detached copies
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        mp.export_parquet(mp.TruthScope((1, 15), (1, 225)), alg,
+            os.path.join(directory, 'detach.parquet'), layout='packed'
+        )
+    assert (alg.profile_info(), alg.cache_info()) == before
+
+def test_exec_bitwidths() -> None:
+    import random
+    rng = random.Random(0)
+    for bits in (2, 3, 5, 16, 32, 64):
+        for dadda in (False, True):
+            alg      = mp.Algorithm(bits, dadda=dadda)
+            packed   = mp.Algorithm(bits, dadda=dadda, packed=True)
+            compiled = mp.Algorithm(bits, dadda=dadda)
+            for x in (alg, packed, compiled):
+                x.auto_resolve_stage()
+            compiled.compile()
+            for _ in range(5):
+                a, b  = rng.randrange(1, 1 << bits), rng.randrange(1, 1 << bits)
+                truth = alg.exec(a, b)
+                final = mp.to_int_matrix(truth[len(truth)-1].matrix)
+                assert sum(final) == a*b and sum(final[1:]) == 0
+                assert packed.exec(a, b) == truth
+                assert compiled.exec(a, b) == truth
+    try:
+        mp.Algorithm(65)
+        assert False
+    except ValueError:
+        pass
+
 
 
+def test_auto_resolve_incremental() -> None:
+    for bits in (4, 8, 64):
+        full = mp.Algorithm(bits)
+        full.auto_resolve_stage()
+        step = mp.Algorithm(bits)
+        while len(step) < len(full):
+            step.auto_resolve_stage(recursive=False)
+        assert str(step) == str(full)
+        assert mp.empty_rows(full[len(full)-1]['pseudo']) == bits-1
+
+    # resolving after a manual stage continues from its pseudo result
+    alg = mp.Algorithm(8)
+    alg.push(mp.Pattern(['a','a','b','b','c','c','d','d']))
+    alg.auto_resolve_stage()
+    truth = alg.exec(a=42, b=255)
+    assert int("".join(truth[len(alg)].matrix[0]), 2) == 42*255
+
+def test_exec_profile() -> None:
+    plain = mp.Algorithm(8, saturation=True)
+    plain.auto_resolve_stage()
+    assert not plain.profile_info()['enabled']
+    plain.exec(3, 5)
+    assert plain.profile_info()['execs'] == 0
+
+    heights = [
+        [c[-1][1] - c[0][1] + 1 for ch, c in stage['template'].bounds.items() if ch != '_']
+        for stage in plain.algorithm.values()
+    ]
+    for compiled in (False, True):
+        alg = mp.Algorithm(8, saturation=True)
+        alg.auto_resolve_stage()
+        if compiled:
+            alg.compile()
+        alg.profile()
+        alg.exec(3, 5)     # every stage
+        alg.exec(200, 100) # saturates after first stage
+        alg.exec(0, 7)     # no stages
+        info = alg.profile_info()
+        assert info['execs'] == 3 and info['saturated'] == 1
+        assert [stage['runs'] for stage in info['stages']] == [2] + [1] * (len(alg) - 1)
+        assert info['stages'][0]['CSA'] == 2 * heights[0].count(3)
+        assert info['units']['ADD'] == sum(h.count(2) for h in heights) + heights[0].count(2)
+        assert (0 < info['merge']) != compiled
+
+        other = mp.Algorithm(8, saturation=True)
+        other.auto_resolve_stage()
+        other.profile()
+        other.profile_merge(info)
+        other.profile_merge(info)
+        assert other.profile_info()['units']['CSA'] == 2 * info['units']['CSA']
+        alg.profile(False)
+        assert not alg.profile_info()['enabled']
+
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    alg.profile()
+    df = mp.truth_dataframe(mp.truth_scope((1, 15), (1, 225)), alg, processes=2, chunk_size=20)
+    assert alg.profile_info()['execs'] == len(df)
+    assert alg.profile_info()['stages'][0]['runs'] == len(df)
 
 
 def main():
@@ -258,6 +441,15 @@ def main():
     test_exec_saturation()
     test_exec_dadda()
     test_exec_dadda_saturation()
+    test_exec_packed()
+    test_exec_compiled()
+    test_exec_batch()
+    test_exec_snapshots()
+    test_exec_cache()
+    test_detach()
+    test_exec_bitwidths()
+    test_auto_resolve_incremental()
+    test_exec_profile()
     # test_step()
     # test_exec(15, 15)
     # test_exec(255, 255)
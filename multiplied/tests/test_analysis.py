@@ -4,8 +4,83 @@ import pandas as pd
 import pyarrow as pa
 
 
-def test_pq_extract_bits() -> None:
-    ...
+def test_truth_table_dataset(tmp_path) -> None:
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    root = str(tmp_path / 'dataset_4b')
+    with mp.TruthTableDataset(root) as ds:
+        paths = ds.write(alg, partition_bits=2, processes=2, batch_size=20)
+        assert len(paths) == 4
+        assert ds.fingerprints == [alg.fingerprint()]
+        assert ds.count() == 256
+        assert ds.shift() == 2
+
+        df = ds.to_pandas(a=(5, 9), output=(10, 40), stages=[1], columns=['a', 'b', 'output'])
+        assert list(df.columns[:3]) == ['a', 'b', 'output']
+        assert len(df.columns) == 3 + 32
+        assert df['a'].between(5, 9).all() and df['output'].between(10, 40).all()
+        expected = mp.truth_dataframe(
+            ((a, b) for a in range(5, 10) for b in range(16) if 10 <= a*b <= 40), alg
+        )
+        df = df.sort_values(['a', 'b'], ignore_index=True)
+        assert df.equals(expected[df.columns])
+
+    other = mp.Algorithm(4, saturation=True)
+    other.auto_resolve_stage()
+    with mp.TruthTableDataset(root) as ds:
+        ds.write(other, mp.truth_scope((1, 15), (1, 255)), partition_bits=1, batch_size=8)
+        assert len(ds.fingerprints) == 2
+        assert ds.shift() is None
+        assert ds.count(alg=alg) == 256
+        for batch in ds.scan(alg=other, b=3, columns=['a', 'b', 'alg']):
+            assert (batch['b'] == 3).all() and (batch['alg'] == other.fingerprint()).all()
+
+
+def test_truth_table_dataset_no_metadata(tmp_path) -> None:
+    import os
+
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    directory = tmp_path / 'dataset_4b' / 'alg=x' / 'a_hi=0'
+    os.makedirs(directory)
+    df = mp.truth_dataframe(mp.truth_scope((1, 15), (1, 255)), alg)
+    df.to_parquet(directory / 'part-0.parquet')
+    with mp.TruthTableDataset(str(tmp_path / 'dataset_4b')) as ds:
+        assert ds.shift() is None and ds.shift() is None # cached, no pruning
+        assert ds.count(a=(1, 3)) == int(df['a'].between(1, 3).sum())
+        assert len(ds.to_pandas(a=(1, 3), columns=['a'])) == ds.count(a=(1, 3))
+
+
+def test_pq_extract_bits(tmp_path) -> None:
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    path = str(tmp_path / 'extract_4b.parquet')
+    mp.export_parquet(mp.truth_scope((1, 15), (1, 255)), alg, path, batch_size=16)
+    df = pd.read_parquet(path)
+
+    bits = mp.pq_extract_bits(path, [7, 0], [0, 2])
+    assert list(bits.columns) == [
+        f"stage_{s}_ppm_{p}_b_{b}" for s in (0, 2) for p in range(4) for b in (7, 0)
+    ]
+    assert bits.equals(df[bits.columns])
+
+    bits = mp.pq_extract_bits(path, [3], [1], ppm=[0], columns=['a', 'output'], a=(3, 5), output=(10, 30))
+    mask = df['a'].between(3, 5) & df['output'].between(10, 30)
+    assert list(bits.columns) == ['a', 'output', 'stage_1_ppm_0_b_3']
+    assert bits.equals(df.loc[mask, bits.columns].reset_index(drop=True))
+
+def test_pq_extract_stages_no_metadata(tmp_path) -> None:
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    scope = lambda: mp.truth_scope((1, 15), (1, 255))
+    path = str(tmp_path / 'packed_4b.parquet')
+    mp.truth_dataframe(scope(), alg, layout='packed').to_parquet(path)
+    assert mp.import_metadata(path) == {}
+
+    df = mp.pq_extract_stages(path)
+    expected = mp.truth_dataframe(scope(), alg)
+    assert len(df.columns) == (len(alg) + 1) * 4 * 8
+    assert df.equals(expected[df.columns])
 
 def test_pq_extract_stages(path: Path) -> None:
     print(path)
@@ -38,6 +113,97 @@ def test_df_global_3d_heatmap() -> None:
     mp.df_global_3d_heatmap(str(path), title, df, dark=True)
 
 
+def test_heatmap_tensor(tmp_path) -> None:
+    import numpy as np
+
+    alg = mp.Algorithm(4, saturation=True)
+    alg.auto_resolve_stage()
+    scope    = list(mp.truth_scope((1, 15), (1, 225)))
+    expected = np.zeros((len(alg) + 1, 4, 8), dtype=np.int64)
+    for a, b in scope:
+        truth = alg.exec(a, b)
+        for s in range(len(alg) + 1):
+            matrix = truth.get(s, truth[len(truth)-1])
+            expected[s] += [[cell == '1' for cell in row] for row in matrix.matrix]
+
+    df     = mp.truth_dataframe((ab for ab in scope), alg)
+    packed = mp.truth_dataframe((ab for ab in scope), alg, layout='packed')
+    assert (mp.heatmap_tensor(df) == expected).all()
+    assert (mp.heatmap_tensor(packed) == expected).all()
+    assert (mp.heatmap_tensor(df[['a', 'stage_2_ppm_1_b_3']], bits=4)[2, 1, 4] == expected[2, 1, 4])
+
+    mp.df_global_heatmap(str(tmp_path / 'global.svg'), 'tensor', expected)
+    mp.df_global_3d_heatmap(str(tmp_path / 'global_3d.svg'), 'tensor', expected)
+    assert (tmp_path / 'global.svg').exists() and (tmp_path / 'global_3d.svg').exists()
+
+def test_heatmap_accumulator(tmp_path) -> None:
+    alg = mp.Algorithm(4, saturation=True)
+    alg.auto_resolve_stage()
+    scope    = list(mp.truth_scope((1, 15), (1, 225))) + [(0, 5)]
+    expected = mp.heatmap_tensor(mp.truth_dataframe((ab for ab in scope), alg))
+
+    for layout in ('bits', 'packed'):
+        path = str(tmp_path / f"{layout}.parquet")
+        mp.export_parquet((ab for ab in scope), alg, path, batch_size=32, layout=layout)
+        acc = mp.HeatmapAccumulator().add_parquet(path, batch_size=10)
+        assert acc.rows == len(scope) and (acc.tensor == expected).all()
+
+    live = mp.HeatmapAccumulator(stages=len(alg) + 1)
+    for truth in mp.truth_table((ab for ab in scope), alg):
+        live.update(truth)
+    assert (live.tensor == expected).all()
+
+    halves = [mp.HeatmapAccumulator(), mp.HeatmapAccumulator()]
+    for i, df in enumerate(mp.import_parquet(str(tmp_path / 'bits.parquet'), 100)):
+        halves[i & 1].update(df)
+    combined = halves[0] + halves[1]
+    assert combined.rows == len(scope) and (combined.tensor == expected).all()
+
+    mp.df_global_heatmap(str(tmp_path / 'acc.svg'), 'accumulated', combined)
+
+def test_heatmap_counts() -> None:
+    alg = mp.Algorithm(8, saturation=True)
+    alg.auto_resolve_stage()
+    scope    = mp.TruthScope((1, 255), (1, 4000))
+    expected = mp.heatmap_tensor(mp.truth_dataframe(scope, alg, layout='packed'))
+
+    serial = mp.heatmap_counts(scope, alg, processes=1, shards=3, batch_size=500)
+    assert serial.rows == len(scope) and (serial.tensor == expected).all()
+    parallel = mp.heatmap_counts(scope, alg, processes=2, shards=7)
+    assert parallel.rows == len(scope) and (parallel.tensor == expected).all()
+
+    wide = mp.Algorithm(40)
+    wide.auto_resolve_stage()
+    sample = mp.SampleScope(40, 30, method='popcount', seed=3)
+    live   = mp.HeatmapAccumulator(stages=len(wide) + 1)
+    for truth in mp.truth_table((ab for ab in sample), wide):
+        live.update(truth)
+    assert (mp.heatmap_counts(sample, wide, processes=1).tensor == live.tensor).all()
+
+def test_df_stage_heatmap(tmp_path) -> None:
+    alg = mp.Algorithm(8)
+    alg.auto_resolve_stage()
+    acc    = mp.heatmap_counts(mp.TruthScope((1, 255), (1, 65535)), alg, processes=1)
+    bounds = alg.algorithm[0]['template'].find_bounding_box()
+
+    mp.df_stage_heatmap(str(tmp_path / 'stages.svg'), acc, [], title='all stages')
+    mp.df_stage_bound_heatmap(str(tmp_path / 'bound.svg'), acc.tensor, [0, 1], bounds['A'])
+    assert (tmp_path / 'stages.svg').exists() and (tmp_path / 'bound.svg').exists()
+
+    alg4 = mp.Algorithm(4)
+    alg4.auto_resolve_stage()
+    df = mp.truth_dataframe(mp.truth_scope((1, 15), (1, 225)), alg4)
+    mp.df_stage_heatmap(str(tmp_path / 'df.svg'), df, [0, 2])
+    try:
+        mp.df_stage_heatmap(str(tmp_path / 'bad.svg'), acc, [len(alg) + 1])
+        assert False
+    except ValueError:
+        pass
+    try:
+        mp.df_stage_bound_heatmap(str(tmp_path / 'bad.svg'), acc, [0], [(0, 0), (16, 0)])
+        assert False
+    except ValueError:
+        pass
 
 def test_pq_global_heatmap(path: Path) -> None:
     print(path)
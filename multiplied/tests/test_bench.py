@@ -0,0 +1,54 @@
+import json
+from multiplied import bench
+
+
+def test_bench_run() -> None:
+    results = bench.run([4, 40], rows=16, repeat=1, only=['exec', 'exec_batch', 'export_parquet'])
+    assert set(results['results']) == {'exec/4', 'exec_batch/4', 'export_parquet/4', 'exec/40'}
+    for result in results['results'].values():
+        assert result['rows'] == 16
+        assert 0 < result['rows_per_s'] and 0 <= result['peak_bytes']
+        assert not result['pooled']
+    assert bench.BENCHMARKS['truth_dataframe'].pooled
+    assert not bench.BENCHMARKS['heatmap_counts'].pooled
+
+def test_bench_compare(tmp_path) -> None:
+    baseline = {'results': {
+        'exec/4': {'rows_per_s': 1000.0, 'peak_bytes': 100},
+        'hoist/4': {'rows_per_s': 1000.0, 'peak_bytes': 100},
+    }}
+    current = {'results': {
+        'exec/4': {'rows_per_s': 850.0, 'peak_bytes': 100},
+        'hoist/4': {'rows_per_s': 950.0, 'peak_bytes': 105},
+        'matrix/4': {'rows_per_s': 1.0, 'peak_bytes': 1},
+    }}
+    rows = {row['benchmark']: row for row in bench.compare(baseline, current, threshold=0.1)}
+    assert set(rows) == {'exec/4', 'hoist/4'}
+    assert rows['exec/4']['regressed'] and not rows['hoist/4']['regressed']
+
+    path = tmp_path / 'baseline.json'
+    assert bench.main(['--bits', '4', '--rows', '8', '--repeat', '1', '--only', 'matrix',
+        '--output', str(path)]) == 0
+    stored = json.loads(path.read_text())
+    assert 'matrix/4' in stored['results'] and stored['meta']['rows'] == 8
+    stored['results']['matrix/4']['rows_per_s'] *= 1000 # force regression
+    path.write_text(json.dumps(stored))
+    assert bench.main(['--bits', '4', '--rows', '8', '--repeat', '1', '--only', 'matrix',
+        '--compare', str(path)]) == 1
+
+    # bad baselines are rejected before any benchmark runs
+    path.write_text('{"results": [1, 2]}')
+    for baseline in (path, tmp_path / 'missing.json'):
+        try:
+            bench.main(['--bits', '4', '--only', 'matrix', '--compare', str(baseline)])
+            assert False
+        except SystemExit as e:
+            assert e.code == 2
+
+
+def main() -> None:
+    test_bench_run()
+
+
+if __name__ == "__main__":
+    main()
@@ -86,6 +86,110 @@ def test_export_parquet_8() -> None:
     # print(", ".join(f"{v}" for k, v in row.items()))
 
 
+def test_export_parquet_stream(tmp_path) -> None:
+    import pyarrow.parquet as pq
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    path = str(tmp_path / 'stream_4b.parquet')
+    mp.export_parquet(mp.truth_scope((1, 15), (1, 255)), alg, path, batch_size=64)
+    df = mp.truth_dataframe(mp.truth_scope((1, 15), (1, 255)), alg)
+    assert pq.ParquetFile(path).num_row_groups == -(-len(df) // 64)
+    assert pd.read_parquet(path).equals(df)
+
+def test_import_parquet_batches(tmp_path) -> None:
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    path = str(tmp_path / 'batches_4b.parquet')
+    mp.export_parquet(mp.truth_scope((1, 15), (1, 255)), alg, path)
+    df = pd.read_parquet(path)
+
+    batches = list(mp.import_parquet(path, 50))
+    assert all(len(batch) <= 50 for batch in batches)
+    assert pd.concat(batches, ignore_index=True).equals(df)
+
+    batches = list(mp.import_parquet(path, 50, stages=[1], bits=[0, 7], columns=['a']))
+    subset  = pd.concat(batches, ignore_index=True)
+    assert list(subset.columns) == ['a'] + [
+        f"stage_1_ppm_{p}_b_{b}" for p in range(4) for b in (7, 0)
+    ]
+    assert subset.equals(df[subset.columns])
+    assert isinstance(next(mp.import_parquet(path, 50, arrow=True)), pa.RecordBatch)
+
+def test_import_metadata(tmp_path) -> None:
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    path = str(tmp_path / 'metadata_4b.parquet')
+    mp.export_parquet(mp.truth_scope((1, 15), (1, 255)), alg, path, batch_size=64)
+    metadata = mp.import_metadata(path)
+    df = pd.read_parquet(path)
+    assert metadata['bits'] == 4
+    assert metadata['stages'] == len(alg) + 1
+    assert metadata['rows'] == len(df)
+    assert metadata['fingerprint'] == alg.fingerprint()
+    assert metadata['domain'] == [df[['a', 'b']].min().min(), df[['a', 'b']].max().max()]
+    assert metadata['range'] == [df['output'].min(), df['output'].max()]
+    assert mp.pq_extract_stages(path).shape == (len(df), metadata['stages'] * 32)
+
+    other = mp.Algorithm(4, saturation=True)
+    other.auto_resolve_stage()
+    assert other.fingerprint() != alg.fingerprint()
+
+def test_operand_filter_bounds(tmp_path) -> None:
+    from multiplied.io.parquet import operand_filter
+
+    assert operand_filter(a=(3, 3), b=7) is not None
+    for bounds in ({'a': (5, 3)}, {'output': (30, 10)}):
+        try:
+            operand_filter(**bounds)
+            assert False
+        except ValueError:
+            pass
+
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    with mp.TruthTableDataset(str(tmp_path / 'dataset_4b')) as ds:
+        ds.write(alg, mp.truth_scope((1, 15), (1, 255)), partition_bits=1)
+        try:
+            ds.count(a=(9, 2))
+            assert False
+        except ValueError:
+            pass
+
+def test_export_parquet_packed(tmp_path) -> None:
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    bits_path   = str(tmp_path / 'bits_4b.parquet')
+    packed_path = str(tmp_path / 'packed_4b.parquet')
+    mp.export_parquet(mp.truth_scope((1, 15), (1, 255)), alg, bits_path)
+    mp.export_parquet(mp.truth_scope((1, 15), (1, 255)), alg, packed_path, layout='packed')
+    assert mp.import_metadata(packed_path)['layout'] == 'packed'
+
+    df     = pd.read_parquet(bits_path)
+    packed = pd.read_parquet(packed_path)
+    assert mp.truth_layout(packed.columns) == 'packed'
+    assert len(packed.columns) == 3 + (len(alg) + 1) * 4 * 2
+    assert packed.equals(mp.truth_dataframe(mp.truth_scope((1, 15), (1, 255)), alg, layout='packed'))
+
+    unpacked = mp.unpack_truth_frame(packed)
+    assert unpacked.equals(df[unpacked.columns])
+    assert mp.pq_extract_stages(packed_path).equals(mp.pq_extract_stages(bits_path))
+    assert mp.pq_extract_bits(packed_path, [6, 1], [2], ppm=[1], columns=['a'], b=(2, 7)).equals(
+        mp.pq_extract_bits(bits_path, [6, 1], [2], ppm=[1], columns=['a'], b=(2, 7))
+    )
+    batches = list(mp.import_parquet(packed_path, 64, stages=[0]))
+    assert list(batches[0].columns) == [f"stage_0_ppm_{p}_{k}" for p in range(4) for k in 'vo']
+
+def test_export_parquet_processes(tmp_path) -> None:
+    alg = mp.Algorithm(4)
+    alg.auto_resolve_stage()
+    serial   = str(tmp_path / 'serial_4b.parquet')
+    parallel = str(tmp_path / 'parallel_4b.parquet')
+    mp.export_parquet(mp.truth_scope((1, 15), (1, 255)), alg, serial, batch_size=16)
+    mp.export_parquet(mp.truth_scope((1, 15), (1, 255)), alg, parallel,
+        batch_size=16, processes=2, prefetch=2
+    )
+    assert pd.read_parquet(parallel).equals(pd.read_parquet(serial))
+    assert mp.import_metadata(parallel) == mp.import_metadata(serial)
 
 
 def main() -> None:
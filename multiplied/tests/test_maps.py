@@ -3,11 +3,23 @@ import multiplied as mp
 def test_dadda_map(bits) -> None:
     try:
         mp.build_dadda_map(0)
-    except KeyError:
+        assert False
+    except ValueError:
         pass
     m = mp.build_dadda_map(bits)
     mp.mprint(m)
 
+def test_dadda_map_generated() -> None:
+    assert mp.build_dadda_map(4).map == [
+        ['00','00','00','00'] + ['00']*4,
+        ['00','00','00','FF'] + ['00']*4,
+        ['00','00','FE','FF'] + ['00']*4,
+        ['00','FD','FE','FF'] + ['00']*4,
+    ]
+    m = mp.build_dadda_map(16)
+    assert m.map[15][:16] == ['00'] + [f"{256-i:02X}" for i in range(15, 0, -1)]
+    assert all(ch == '00' for row in m.map for ch in row[16:])
+
 def test_resolve_simple_map() -> None:
     sm = mp.Map(
         [
@@ -39,6 +51,7 @@ def test_apply_rmap() -> None:
 
 def main():
     test_dadda_map(8)
+    test_dadda_map_generated()
     test_resolve_simple_map()
     test_empty_map(4)
     test_apply_rmap()
@@ -28,6 +28,16 @@ def test_pop_build_matrix():
     # print(vars(mult_by_zero_a))
     # print(vars(mult_by_zero_b))
 
+def test_pop_packed_matrix():
+    for a, b in [(0, 0), (0, 42), (165, 90), (255, 255)]:
+        matrix = mp.Matrix(8, a=a, b=b)
+        packed = mp.Matrix(8, a=a, b=b, packed=True)
+        assert packed.packed
+        assert packed == matrix
+        assert packed.matrix == matrix.matrix
+        assert mp.Matrix(matrix.matrix, packed=True) == packed
+    assert mp.pretty(mp.Matrix(4, a=11, b=5, packed=True)) == mp.pretty(mp.Matrix(4, a=11, b=5))
+
 # def test_pop_agorithm(): ## POPULATION NO IMPLEMENTED ##
 #     temp1 = mp.Matrix(8) # Placeholder for template <-- update this
 #     temp2 = mp.Matrix(8) # Placeholder for template <-- update this
@@ -44,6 +54,7 @@ def test_pop_build_matrix():
 def main() -> None:
     test_pop_empty_matrix()
     test_pop_build_matrix()
+    test_pop_packed_matrix()
     # test_pop_agorithm()
 
 if __name__ == "__main__":
@@ -69,6 +69,40 @@ def test_resolve_pattern() -> None:
     mytemplate = mp.Template(mypattern)
     print(mytemplate.__repr__())
 
+def test_template_cache() -> None:
+    mp.template_cache_clear()
+    pattern = mp.Pattern(['a','a','a','b','b','c','_','_'])
+    first   = mp.Template(pattern, matrix=mp.Matrix(8, a=5, b=4))
+    second  = mp.Template(pattern, matrix=mp.Matrix(8, a=255, b=3)) # same occupancy
+    info    = mp.template_cache_info()
+    assert (info['hits'], info['misses'], info['currsize']) == (1, 1, 1)
+    assert first.template == second.template and first.result == second.result
+    assert first.bounds == second.bounds
+
+    # templates own their rows, mutating one leaves the cache intact
+    second.template[0][-1] = '?'
+    assert mp.Template(pattern, matrix=mp.Matrix(8)).template == first.template
+
+    # pattern chars reach pseudo matrices, non-ASCII rows key by occupancy too
+    pseudo = mp.Matrix(mp.Template(mp.Pattern(['é','é','é','ø','ø','_','_','_'])).result)
+    ascii_ = mp.Matrix([['_' if ch == '_' else '1' for ch in row] for row in pseudo.matrix])
+    reduce = mp.Pattern(['x','x','x','y','y','_','_','_'])
+    before = mp.template_cache_info()['hits']
+    cached = mp.Template(reduce, matrix=pseudo)
+    assert mp.Template(reduce, matrix=ascii_).template == cached.template
+    assert mp.template_cache_info()['hits'] == before + 1
+
+    mp.template_cache_clear(maxsize=0)
+    assert mp.Template(reduce, matrix=pseudo).template == cached.template
+    mp.Template(pattern)
+    assert mp.template_cache_info()['currsize'] == 0
+    mp.template_cache_clear(maxsize=1024)
+    try:
+        mp.template_cache_clear(maxsize=-1)
+        assert False
+    except ValueError:
+        pass
+
 
 def main() -> None:
     # test_temp_build_csa4()
@@ -78,6 +112,7 @@ def main() -> None:
     test_build_from_pattern()
     test_resolve_rmap()
     test_resolve_pattern()
+    test_template_cache()
 
 
 if __name__ == "__main__":
@@ -49,6 +49,113 @@ def test_truth_dataframe() -> None:
     df = mp.truth_dataframe(scope, alg)
     print(df)
 
+def test_truth_dataframe_chunks() -> None:
+    alg = mp.Algorithm(4, saturation=True)
+    alg.auto_resolve_stage()
+    df  = mp.truth_dataframe(mp.truth_scope((1, 15), (1, 225)), alg)
+    df2 = mp.truth_dataframe(mp.truth_scope((1, 15), (1, 225)), alg, processes=2, chunk_size=7)
+    assert df.equals(df2)
+    for _, row in df.iloc[::17].iterrows():
+        truth = alg.exec(int(row['a']), int(row['b']))
+        final = truth[len(alg)]
+        assert row[f"ppm_s_{len(alg)}"] == str(str(final).split('\n')[:-1])
+        assert row[f"stage_{len(alg)}_ppm_0_b_0"] == int(final.matrix[0][-1] == '1')
+
+def test_parallel_truth_table() -> None:
+    alg = mp.Algorithm(4, saturation=True)
+    alg.auto_resolve_stage()
+    scope    = list(mp.truth_scope((1, 15), (1, 225))) + [(0, 3)]
+    expected = list(mp.truth_table((ab for ab in scope), alg))
+
+    ordered = list(mp.parallel_truth_table((ab for ab in scope), alg,
+        processes=2, chunk_size=7, prefetch=2
+    ))
+    assert [ab for ab, _ in ordered] == scope
+    assert [truth for _, truth in ordered] == expected
+
+    unordered = mp.parallel_truth_table((ab for ab in scope), alg,
+        processes=2, chunk_size=5, ordered=False
+    )
+    assert dict(unordered) == dict(zip(scope, expected))
+
+    stream = mp.parallel_truth_table((ab for ab in scope), alg, processes=2, chunk_size=3)
+    assert next(stream) == (scope[0], expected[0])
+    stream.close() # terminates pool
+
+def test_truth_scope_object() -> None:
+    brute = [
+        (a, b) for a in range(3, 41) for b in range(3, 41)
+        if 50 <= a*b <= 700
+    ]
+    scope = mp.TruthScope((3, 40), (50, 700))
+    assert len(scope) == len(brute)
+    assert list(scope) == brute
+    assert list(mp.truth_scope((3, 40), (50, 700))) == brute
+    assert (15, 15) in list(mp.truth_scope((1, 15), (1, 225))) # inclusive bounds
+
+    shards = scope.shards(7)
+    assert [ab for shard in shards for ab in shard] == brute
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+    pairs = []
+    for a, b in scope.shard(2, 3).batches(64):
+        assert len(a) <= 64 and a.dtype == b.dtype
+        pairs += zip(a.tolist(), b.tolist())
+    assert pairs == list(scope.shard(2, 3))
+
+    alg = mp.Algorithm(8)
+    alg.auto_resolve_stage()
+    df = mp.truth_dataframe(scope, alg)
+    assert len(df) == len(brute)
+    assert (df['a'] * df['b'] == df['output']).all()
+    assert mp.TruthScope((1, 2**64 - 1), (1, 2**128)).size == (2**64 - 1)**2
+
+def test_truth_scope_wide_batches() -> None:
+    from itertools import islice
+
+    for scope in (
+        mp.TruthScope((1, 2**32 - 1), (1, 2**64 - 1)).shard(3, 4),
+        mp.TruthScope((1, 2**64 - 1), (1, 2**128)).shard(3, 4),
+    ):
+        assert 2**63 < scope.start
+        pairs = []
+        for a, b in islice(scope.batches(4), 3):
+            assert len(a) == len(b) == 4
+            pairs += zip(a.tolist(), b.tolist())
+        assert pairs == list(islice(iter(scope), 12))
+
+def test_scope_abstract() -> None:
+    class Partial(mp.Scope):
+        def batches(self, batch_size: int = 16384):
+            yield from ()
+    try:
+        Partial()
+        assert False
+    except TypeError:
+        pass
+
+def test_sample_scope() -> None:
+    for method in ('uniform', 'magnitude', 'popcount', 'sobol'):
+        scope = mp.SampleScope(16, 5000, method=method, seed=11)
+        pairs = list(scope)
+        assert len(pairs) == len(scope) == 5000
+        assert pairs == list(mp.SampleScope(16, 5000, method=method, seed=11))
+        assert pairs == [ab for shard in scope.shards(3) for ab in shard]
+        assert all(0 <= a < 1 << 16 and 0 <= b < 1 << 16 for a, b in pairs)
+
+    magnitude = mp.SampleScope(16, 93, method='magnitude')
+    assert [a.bit_length() + b.bit_length() for a, b in magnitude] == [2 + i % 31 for i in range(93)]
+    popcount = mp.SampleScope(16, 99, method='popcount')
+    assert [a.bit_count() + b.bit_count() for a, b in popcount] == [i % 33 for i in range(99)]
+    sobol = list(mp.SampleScope(8, 256, method='sobol', seed=5))
+    assert sorted(a for a, _ in sobol) == sorted(b for _, b in sobol) == list(range(256))
+
+    alg = mp.Algorithm(16)
+    alg.auto_resolve_stage()
+    df = mp.truth_dataframe(mp.SampleScope(16, 200, method='magnitude', seed=2), alg, layout='packed')
+    assert len(df) == 200
+    assert (df['a'] * df['b'] == df['output']).all()
+
 
 def main() -> None:
     test_scope()
@@ -15,9 +15,33 @@ def test_allchars() -> None:
     m = mp.Template(mp.Pattern(['a','a','a','b']))
     print(mp.allchars(m.template))
 
+def test_lazy_imports() -> None:
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, multiplied as mp\n"
+        "alg = mp.Algorithm(4)\n"
+        "alg.auto_resolve_stage()\n"
+        "alg.exec(a=5, b=3)\n"
+        "assert not {'pandas', 'pyarrow', 'matplotlib'} & set(sys.modules)\n"
+        "assert mp.heatmap_tensor is mp.analysis.heatmap.heatmap_tensor\n"
+        "assert 'matplotlib' in sys.modules\n"
+    )
+    root = os.path.dirname(os.path.dirname(mp.__file__))
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=root)
+    assert 'TruthWriter' in dir(mp)
+    try:
+        mp.not_an_attribute
+    except AttributeError:
+        return
+    assert False
+
 def main():
     test_gen_and_tff()
     test_allchars()
+    test_lazy_imports()
 
 if __name__ == "__main__":
     main()